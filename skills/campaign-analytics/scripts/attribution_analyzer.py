@@ -18,13 +18,45 @@ Usage:
 
 import argparse
 import json
+import math
+import os
 import sys
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import Any, DefaultDict, Dict, Iterable, List, NamedTuple, Optional
 
 
 MODELS = ["first-touch", "last-touch", "linear", "time-decay", "position-based"]
 
+# Position-based credit split: first/last touch each, shared middle, and
+# the even split used when a journey has exactly two touchpoints.
+POSITION_ENDPOINT_SHARE = 0.4
+POSITION_MIDDLE_SHARE = 0.2
+POSITION_PAIR_SHARE = 0.5
+
+# Below this many converted touchpoints, running models serially beats the
+# cost of starting worker processes.
+PARALLEL_MIN_TOUCHPOINTS = 200_000
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+class JourneyData(NamedTuple):
+    """Converted journeys flattened into parallel arrays (struct-of-arrays).
+
+    The touchpoints of journey ``j`` occupy ``offsets[j]:offsets[j + 1]`` of
+    ``channel_ids`` and ``times``, in chronological order.
+    """
+
+    channels: List[str]  # channel id -> channel name
+    channel_ids: List[int]
+    times: List[float]  # seconds since the epoch
+    offsets: List[int]
+    revenues: List[float]
+
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """Safely divide two numbers, returning default if denominator is zero."""
@@ -33,8 +65,19 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     return numerator / denominator
 
 
+@lru_cache(maxsize=None)
 def parse_timestamp(ts: str) -> datetime:
-    """Parse an ISO-format timestamp string into a datetime object."""
+    """Parse an ISO-format timestamp string into a datetime object.
+
+    Results are memoized: every model sorts the same touchpoints, so each
+    distinct timestamp string is only parsed once. ``fromisoformat`` covers
+    the common layouts; ``strptime`` is only tried for looser inputs such as
+    dates without zero padding.
+    """
+    try:
+        return datetime.fromisoformat(ts)
+    except ValueError:
+        pass
     for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
         try:
             return datetime.strptime(ts, fmt)
@@ -43,156 +86,199 @@ def parse_timestamp(ts: str) -> datetime:
     raise ValueError(f"Cannot parse timestamp: {ts}")
 
 
-def first_touch_attribution(journeys: List[Dict]) -> Dict[str, float]:
-    """First-touch: 100% credit to the first touchpoint in each journey."""
-    credits: Dict[str, float] = {}
+@lru_cache(maxsize=None)
+def to_epoch(ts: str) -> float:
+    """Convert a timestamp string to seconds since the Unix epoch.
+
+    Memoized on the raw string: campaign data repeats timestamps heavily, so
+    parsing cost scales with the number of distinct values. Naive datetimes
+    are measured against a naive epoch so that differences match plain
+    datetime subtraction (no local-time/DST adjustment).
+    """
+    dt = parse_timestamp(ts)
+    if dt.tzinfo is not None:
+        return dt.timestamp()
+    return (dt - _NAIVE_EPOCH).total_seconds()
+
+
+def build_journey_data(journeys: List[Dict]) -> JourneyData:
+    """Flatten converted journeys into the arrays the attribution models consume.
+
+    Filtering, sorting and channel-id assignment happen once here rather than
+    once per model.
+    """
+    channel_map: Dict[str, int] = {}
+    channel_ids: List[int] = []
+    times: List[float] = []
+    offsets: List[int] = [0]
+    revenues: List[float] = []
+
     for journey in journeys:
         if not journey.get("converted", False):
             continue
         touchpoints = journey.get("touchpoints", [])
         if not touchpoints:
             continue
-        sorted_tp = sorted(touchpoints, key=lambda t: parse_timestamp(t["timestamp"]))
-        channel = sorted_tp[0]["channel"]
-        revenue = journey.get("revenue", 1.0)
-        credits[channel] = credits.get(channel, 0.0) + revenue
+        # Sort on epoch seconds so no datetime objects are compared
+        stamped = sorted(((to_epoch(tp["timestamp"]), tp["channel"]) for tp in touchpoints), key=itemgetter(0))
+        for epoch, channel in stamped:
+            channel_ids.append(channel_map.setdefault(channel, len(channel_map)))
+            times.append(epoch)
+        offsets.append(len(channel_ids))
+        revenues.append(journey.get("revenue", 1.0))
+
+    return JourneyData(list(channel_map), channel_ids, times, offsets, revenues)
+
+
+def _named_credits(data: JourneyData, credits: Dict[int, float]) -> Dict[str, float]:
+    """Key a channel-id credit map by channel name."""
+    channels = data.channels
+    return {channels[cid]: value for cid, value in credits.items()}
+
+
+def _scatter_add(channel_ids: Iterable[int], values: Iterable[float]) -> DefaultDict[int, float]:
+    """Sum ``values`` into a credit map keyed by the matching channel id."""
+    credits: DefaultDict[int, float] = defaultdict(float)
+    for cid, value in zip(channel_ids, values):
+        credits[cid] += value
     return credits
 
 
-def last_touch_attribution(journeys: List[Dict]) -> Dict[str, float]:
+def first_touch_attribution(data: JourneyData) -> Dict[str, float]:
+    """First-touch: 100% credit to the first touchpoint in each journey."""
+    channel_ids = data.channel_ids
+    first_ids = [channel_ids[start] for start in data.offsets[:-1]]
+    return _named_credits(data, _scatter_add(first_ids, data.revenues))
+
+
+def last_touch_attribution(data: JourneyData) -> Dict[str, float]:
     """Last-touch: 100% credit to the last touchpoint in each journey."""
-    credits: Dict[str, float] = {}
-    for journey in journeys:
-        if not journey.get("converted", False):
-            continue
-        touchpoints = journey.get("touchpoints", [])
-        if not touchpoints:
-            continue
-        sorted_tp = sorted(touchpoints, key=lambda t: parse_timestamp(t["timestamp"]))
-        channel = sorted_tp[-1]["channel"]
-        revenue = journey.get("revenue", 1.0)
-        credits[channel] = credits.get(channel, 0.0) + revenue
-    return credits
+    channel_ids = data.channel_ids
+    last_ids = [channel_ids[end - 1] for end in data.offsets[1:]]
+    return _named_credits(data, _scatter_add(last_ids, data.revenues))
 
 
-def linear_attribution(journeys: List[Dict]) -> Dict[str, float]:
+def linear_attribution(data: JourneyData) -> Dict[str, float]:
     """Linear: Equal credit split across all touchpoints in each journey."""
-    credits: Dict[str, float] = {}
-    for journey in journeys:
-        if not journey.get("converted", False):
-            continue
-        touchpoints = journey.get("touchpoints", [])
-        if not touchpoints:
-            continue
-        revenue = journey.get("revenue", 1.0)
-        share = safe_divide(revenue, len(touchpoints))
-        for tp in touchpoints:
-            channel = tp["channel"]
-            credits[channel] = credits.get(channel, 0.0) + share
-    return credits
+    offsets = data.offsets
+    lengths = [end - start for start, end in zip(offsets, offsets[1:])]
+    shares = chain.from_iterable(
+        repeat(revenue / length, length) for revenue, length in zip(data.revenues, lengths)
+    )
+    return _named_credits(data, _scatter_add(data.channel_ids, shares))
 
 
-def time_decay_attribution(journeys: List[Dict], half_life_days: float = 7.0) -> Dict[str, float]:
+def time_decay_attribution(data: JourneyData, half_life_days: float = 7.0) -> Dict[str, float]:
     """Time-decay: Exponential decay giving more credit to recent touchpoints.
 
     Uses a configurable half-life (in days). Touchpoints closer to conversion
     receive exponentially more credit.
     """
-    import math
-
-    credits: Dict[str, float] = {}
-    decay_rate = math.log(2) / half_life_days
-
-    for journey in journeys:
-        if not journey.get("converted", False):
-            continue
-        touchpoints = journey.get("touchpoints", [])
-        if not touchpoints:
-            continue
-
-        revenue = journey.get("revenue", 1.0)
-        sorted_tp = sorted(touchpoints, key=lambda t: parse_timestamp(t["timestamp"]))
-        conversion_time = parse_timestamp(sorted_tp[-1]["timestamp"])
-
-        # Calculate raw weights
-        weights: List[float] = []
-        for tp in sorted_tp:
-            tp_time = parse_timestamp(tp["timestamp"])
-            days_before = (conversion_time - tp_time).total_seconds() / 86400.0
-            weight = math.exp(-decay_rate * days_before)
-            weights.append(weight)
+    credits: DefaultDict[int, float] = defaultdict(float)
+    # Fold the seconds-to-days conversion into the rate so the per-touchpoint
+    # work is a single multiply and exp.
+    decay_per_second = math.log(2) / (half_life_days * 86400.0)
+    exp = math.exp
+    channel_ids = data.channel_ids
+    times = data.times
+    offsets = data.offsets
+
+    for j, revenue in enumerate(data.revenues):
+        start, end = offsets[j], offsets[j + 1]
+        conversion_time = times[end - 1]
+
+        # Calculate raw weights in one pass, then scale them to revenue
+        weights = [exp(-decay_per_second * (conversion_time - t)) for t in times[start:end]]
 
         total_weight = sum(weights)
         if total_weight == 0:
             continue
 
-        for i, tp in enumerate(sorted_tp):
-            channel = tp["channel"]
-            share = safe_divide(weights[i], total_weight) * revenue
-            credits[channel] = credits.get(channel, 0.0) + share
+        scale = revenue / total_weight
+        for cid, weight in zip(channel_ids[start:end], weights):
+            credits[cid] += weight * scale
 
-    return credits
+    return _named_credits(data, credits)
 
 
-def position_based_attribution(journeys: List[Dict]) -> Dict[str, float]:
+def position_based_attribution(data: JourneyData) -> Dict[str, float]:
     """Position-based: 40% first, 40% last, 20% split among middle touchpoints."""
-    credits: Dict[str, float] = {}
-    for journey in journeys:
-        if not journey.get("converted", False):
-            continue
-        touchpoints = journey.get("touchpoints", [])
-        if not touchpoints:
-            continue
-
-        revenue = journey.get("revenue", 1.0)
-        sorted_tp = sorted(touchpoints, key=lambda t: parse_timestamp(t["timestamp"]))
-
-        if len(sorted_tp) == 1:
-            channel = sorted_tp[0]["channel"]
-            credits[channel] = credits.get(channel, 0.0) + revenue
-        elif len(sorted_tp) == 2:
-            first_channel = sorted_tp[0]["channel"]
-            last_channel = sorted_tp[-1]["channel"]
-            credits[first_channel] = credits.get(first_channel, 0.0) + revenue * 0.5
-            credits[last_channel] = credits.get(last_channel, 0.0) + revenue * 0.5
+    offsets = data.offsets
+    # Per-touchpoint share, aligned with data.channel_ids
+    shares = [0.0] * len(data.channel_ids)
+    for start, end, revenue in zip(offsets, offsets[1:], data.revenues):
+        count = end - start
+        if count == 1:
+            shares[start] = revenue
+        elif count == 2:
+            shares[start] = shares[start + 1] = revenue * POSITION_PAIR_SHARE
         else:
-            first_channel = sorted_tp[0]["channel"]
-            last_channel = sorted_tp[-1]["channel"]
-            credits[first_channel] = credits.get(first_channel, 0.0) + revenue * 0.4
-            credits[last_channel] = credits.get(last_channel, 0.0) + revenue * 0.4
-
-            middle_count = len(sorted_tp) - 2
-            middle_share = safe_divide(revenue * 0.2, middle_count)
-            for tp in sorted_tp[1:-1]:
-                channel = tp["channel"]
-                credits[channel] = credits.get(channel, 0.0) + middle_share
+            middle_count = count - 2
+            shares[start] = shares[end - 1] = revenue * POSITION_ENDPOINT_SHARE
+            shares[start + 1:end - 1] = repeat(revenue * POSITION_MIDDLE_SHARE / middle_count, middle_count)
+    return _named_credits(data, _scatter_add(data.channel_ids, shares))
 
-    return credits
 
+def run_model(model_name: str, data: JourneyData, half_life: float = 7.0) -> Dict[str, float]:
+    """Dispatch to the appropriate attribution model.
 
-def run_model(model_name: str, journeys: List[Dict], half_life: float = 7.0) -> Dict[str, float]:
-    """Dispatch to the appropriate attribution model."""
+    ``data`` is the output of :func:`build_journey_data`.
+    """
     if model_name == "first-touch":
-        return first_touch_attribution(journeys)
+        return first_touch_attribution(data)
     elif model_name == "last-touch":
-        return last_touch_attribution(journeys)
+        return last_touch_attribution(data)
     elif model_name == "linear":
-        return linear_attribution(journeys)
+        return linear_attribution(data)
     elif model_name == "time-decay":
-        return time_decay_attribution(journeys, half_life)
+        return time_decay_attribution(data, half_life)
     elif model_name == "position-based":
-        return position_based_attribution(journeys)
+        return position_based_attribution(data)
     else:
         raise ValueError(f"Unknown model: {model_name}. Choose from: {', '.join(MODELS)}")
 
 
-def compute_summary(journeys: List[Dict]) -> Dict[str, Any]:
-    """Compute summary statistics about the journey data."""
+def run_models(model_names: List[str], data: JourneyData, half_life: float = 7.0) -> Dict[str, Dict[str, float]]:
+    """Run several attribution models, in parallel processes for large inputs.
+
+    The models are independent, so once the data is large enough to amortize
+    process start-up and pickling they are spread across CPU cores.
+    """
+    if len(model_names) < 2 or len(data.channel_ids) < PARALLEL_MIN_TOUCHPOINTS:
+        return {name: run_model(name, data, half_life) for name in model_names}
+
+    # Imported here: concurrent.futures pulls in multiprocessing and logging,
+    # which would dominate start-up for the common serial case
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(len(model_names), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            run_model,
+            model_names,
+            repeat(data, len(model_names)),
+            repeat(half_life, len(model_names)),
+        )
+        return dict(zip(model_names, results))
+
+
+def compute_summary(journeys: List[Dict], data: Optional[JourneyData] = None) -> Dict[str, Any]:
+    """Compute summary statistics about the journey data.
+
+    When ``data`` (from :func:`build_journey_data`) is given, its channel list
+    already covers every converted journey, so only the remaining journeys
+    are scanned for channels.
+    """
     total_journeys = len(journeys)
-    converted = sum(1 for j in journeys if j.get("converted", False))
-    total_revenue = sum(j.get("revenue", 0.0) for j in journeys if j.get("converted", False))
-    all_channels = set()
+    converted = 0
+    total_revenue = 0.0
+    all_channels = set(data.channels) if data is not None else set()
     for j in journeys:
+        if j.get("converted", False):
+            converted += 1
+            total_revenue += j.get("revenue", 0.0)
+            if data is not None:
+                continue
         for tp in j.get("touchpoints", []):
             all_channels.add(tp["channel"])
 
@@ -232,7 +318,7 @@ def format_text(results: Dict[str, Any]) -> str:
             continue
 
         total_credit = sum(credits.values())
-        sorted_channels = sorted(credits.items(), key=lambda x: x[1], reverse=True)
+        sorted_channels = sorted(credits.items(), key=itemgetter(1), reverse=True)
 
         lines.append(f"  {'Channel':<25} {'Revenue Credit':>15} {'Share':>10}")
         lines.append(f"  {'-'*25} {'-'*15} {'-'*10}")
@@ -256,19 +342,17 @@ def format_text(results: Dict[str, Any]) -> str:
         all_channels_sorted = sorted(all_channels)
 
         model_names = list(results["models"].keys())
-        header = f"  {'Channel':<20}"
-        for mn in model_names:
-            short = mn.replace("-", " ").title()
-            header += f" {short:>14}"
-        lines.append(header)
+        header_cells = [mn.replace("-", " ").title() for mn in model_names]
+        lines.append(f"  {'Channel':<20}" + "".join(f" {short:>14}" for short in header_cells))
         lines.append(f"  {'-'*20}" + f" {'-'*14}" * len(model_names))
 
-        for ch in all_channels_sorted:
-            row = f"  {ch:<20}"
-            for mn in model_names:
-                val = results["models"][mn].get(ch, 0.0)
-                row += f" ${val:>12,.2f}"
-            lines.append(row)
+        # Dense channel x model matrix: one column of credits per model
+        columns = [
+            [credits.get(ch, 0.0) for ch in all_channels_sorted]
+            for credits in results["models"].values()
+        ]
+        for ch, row in zip(all_channels_sorted, zip(*columns)):
+            lines.append(f"  {ch:<20}" + "".join(f" ${val:>12,.2f}" for val in row))
 
     lines.append("")
     return "\n".join(lines)
@@ -308,8 +392,9 @@ def main() -> None:
 
     # Load input data
     try:
-        with open(args.input_file, "r") as f:
-            data = json.load(f)
+        # Raw bytes let json.loads detect the encoding and decode in one pass
+        with open(args.input_file, "rb") as f:
+            data = json.loads(f.read())
     except FileNotFoundError:
         print(f"Error: File not found: {args.input_file}", file=sys.stderr)
         sys.exit(1)
@@ -322,18 +407,20 @@ def main() -> None:
         print("Error: No 'journeys' array found in input data.", file=sys.stderr)
         sys.exit(1)
 
+    # Filter, order and flatten touchpoints once for all models
+    journey_data = build_journey_data(journeys)
+
     # Determine which models to run
     models_to_run = [args.model] if args.model else MODELS
 
     # Run models
     model_results: Dict[str, Dict[str, float]] = {}
-    for model_name in models_to_run:
-        credits = run_model(model_name, journeys, args.half_life)
+    for model_name, credits in run_models(models_to_run, journey_data, args.half_life).items():
         model_results[model_name] = {ch: round(v, 2) for ch, v in credits.items()}
 
     # Build output
     results: Dict[str, Any] = {
-        "summary": compute_summary(journeys),
+        "summary": compute_summary(journeys, journey_data),
         "models": model_results,
     }
 
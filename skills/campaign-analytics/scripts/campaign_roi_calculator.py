@@ -16,12 +16,19 @@ Includes industry benchmarking and underperformance flagging.
 Usage:
     python campaign_roi_calculator.py campaign_data.json
     python campaign_roi_calculator.py campaign_data.json --format json
+    python campaign_roi_calculator.py campaign_data.json --cache
 """
 
 import argparse
+import hashlib
 import json
+import os
+import pickle
 import sys
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 # Industry benchmark ranges by channel
@@ -62,6 +69,106 @@ BENCHMARKS: Dict[str, Dict[str, tuple]] = {
     },
 }
 
+# Flattened views of BENCHMARKS: one hash lookup per (metric, channel) pair,
+# with the per-metric default row kept separately for unknown channels.
+BENCHMARK_TABLE: Dict[Tuple[str, str], tuple] = {
+    (metric, channel): benchmark
+    for metric, by_channel in BENCHMARKS.items()
+    for channel, benchmark in by_channel.items()
+}
+DEFAULT_BENCHMARKS: Dict[str, tuple] = {metric: by_channel["default"] for metric, by_channel in BENCHMARKS.items()}
+
+# Assessment labels indexed by how many benchmark thresholds a value clears
+_LADDER_LABELS = ("underperforming", "below_target", "good", "excellent")
+_COST_LADDER_LABELS = _LADDER_LABELS[::-1]
+
+# Portfolios smaller than this are computed serially; below it, worker
+# start-up and pickling cost more than the per-campaign work saves.
+PARALLEL_MIN_CAMPAIGNS = 1024
+
+
+def _round2(value: Optional[float]) -> Optional[float]:
+    """Round a metric to two decimals, passing None through."""
+    return round(value, 2) if value is not None else None
+
+
+@dataclass
+class CampaignMetrics:
+    """Calculated metrics for one campaign, unrounded.
+
+    Ratio fields are None when their denominator (customers, leads, clicks or
+    impressions) is zero.
+    """
+
+    __slots__ = (
+        "spend", "revenue", "profit", "roi_pct", "roas", "cpa", "cpl", "cac", "ctr_pct",
+        "cvr_pct", "cpc", "cpm", "lead_conversion_rate_pct", "impressions", "clicks", "leads", "customers",
+    )
+
+    spend: float
+    revenue: float
+    profit: float
+    roi_pct: float
+    roas: float
+    cpa: Optional[float]
+    cpl: Optional[float]
+    cac: Optional[float]
+    ctr_pct: Optional[float]
+    cvr_pct: Optional[float]
+    cpc: Optional[float]
+    cpm: Optional[float]
+    lead_conversion_rate_pct: Optional[float]
+    impressions: int
+    clicks: int
+    leads: int
+    customers: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metrics as a plain dict in output field order.
+
+        Money and rate fields are carried unrounded and rounded to two
+        decimals only here, once, at serialization time.
+        """
+        # Every field except the four trailing integer counts is rounded
+        data = {name: _round2(getattr(self, name)) for name in self.__slots__[:-4]}
+        data["impressions"] = self.impressions
+        data["clicks"] = self.clicks
+        data["leads"] = self.leads
+        data["customers"] = self.customers
+        return data
+
+
+@dataclass
+class CampaignResult:
+    """Metrics, benchmark assessments and advice for one campaign."""
+
+    __slots__ = ("name", "channel", "metrics", "assessments", "flags", "recommendations")
+
+    name: str
+    channel: str
+    metrics: CampaignMetrics
+    assessments: Dict[str, Any]
+    flags: List[str]
+    recommendations: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dict in output field order."""
+        return {
+            "name": self.name,
+            "channel": self.channel,
+            "metrics": self.metrics.to_dict(),
+            "assessments": self.assessments,
+            "flags": self.flags,
+            "recommendations": self.recommendations,
+        }
+
+
+def _to_json(obj: Any) -> Any:
+    """json.dump hook: convert result objects to dicts while encoding."""
+    if isinstance(obj, (CampaignResult, CampaignMetrics)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """Safely divide two numbers, returning default if denominator is zero."""
@@ -76,8 +183,10 @@ def get_benchmark(metric: str, channel: str) -> tuple:
     Returns:
         Tuple of (low, target, high) for the given metric and channel.
     """
-    metric_benchmarks = BENCHMARKS.get(metric, {})
-    return metric_benchmarks.get(channel, metric_benchmarks.get("default", (0, 0, 0)))
+    benchmark = BENCHMARK_TABLE.get((metric, channel))
+    if benchmark is None:
+        benchmark = DEFAULT_BENCHMARKS.get(metric, (0, 0, 0))
+    return benchmark
 
 
 def assess_performance(value: float, benchmark: tuple, higher_is_better: bool = True) -> str:
@@ -91,37 +200,50 @@ def assess_performance(value: float, benchmark: tuple, higher_is_better: bool =
     Returns:
         Performance assessment string.
     """
+    if value != value:
+        # NaN compares false against every threshold
+        return "underperforming"
+    # Benchmarks are ascending (low <= target <= high), so the number of
+    # thresholds a value has cleared indexes straight into the label ladder.
+    if higher_is_better:
+        return _LADDER_LABELS[bisect_right(benchmark, value)]
+    # For cost metrics, lower is better
+    return _COST_LADDER_LABELS[bisect_left(benchmark, value)]
+
+
+@lru_cache(maxsize=128)
+def benchmark_range(benchmark: tuple) -> Dict[str, float]:
+    """Return the {"low", "target", "high"} dict for a benchmark tuple.
+
+    Cached so campaigns sharing a benchmark share one dict; callers must
+    treat it as read-only.
+    """
     low, target, high = benchmark
+    return {"low": low, "target": target, "high": high}
 
-    if higher_is_better:
-        if value >= high:
-            return "excellent"
-        elif value >= target:
-            return "good"
-        elif value >= low:
-            return "below_target"
-        else:
-            return "underperforming"
-    else:
-        # For cost metrics, lower is better
-        if value <= low:
-            return "excellent"
-        elif value <= target:
-            return "good"
-        elif value <= high:
-            return "below_target"
-        else:
-            return "underperforming"
-
-
-def calculate_campaign_metrics(campaign: Dict[str, Any]) -> Dict[str, Any]:
+
+def assess_metric(metric: str, channel: str, value: float, higher_is_better: bool = True) -> Tuple[tuple, str]:
+    """Look up the benchmark for a metric/channel and assess a value against it.
+
+    Not memoized: campaign ratios are rarely exactly equal, so a cache keyed
+    on the value would almost never hit. The lookup is one dict access and
+    the assessment a bisect over three thresholds.
+
+    Returns:
+        Tuple of (benchmark, assessment).
+    """
+    benchmark = get_benchmark(metric, channel)
+    return benchmark, assess_performance(value, benchmark, higher_is_better)
+
+
+def calculate_campaign_metrics(campaign: Dict[str, Any]) -> CampaignResult:
     """Calculate all ROI metrics for a single campaign.
 
     Args:
         campaign: Dict with keys: name, channel, spend, revenue, impressions, clicks, leads, customers.
 
     Returns:
-        Dict with all calculated metrics, benchmarks, and assessments.
+        CampaignResult with all calculated metrics, benchmarks, and assessments.
     """
     name = campaign.get("name", "Unnamed Campaign")
     channel = campaign.get("channel", "default")
@@ -132,53 +254,50 @@ def calculate_campaign_metrics(campaign: Dict[str, Any]) -> Dict[str, Any]:
     leads = campaign.get("leads", 0)
     customers = campaign.get("customers", 0)
 
-    # Core metrics
-    roi = safe_divide(revenue - spend, spend) * 100
-    roas = safe_divide(revenue, spend)
-    cpa = safe_divide(spend, customers) if customers > 0 else None
-    cpl = safe_divide(spend, leads) if leads > 0 else None
-    cac = safe_divide(spend, customers) if customers > 0 else None
-    ctr = safe_divide(clicks, impressions) * 100 if impressions > 0 else None
-    cvr = safe_divide(customers, leads) * 100 if leads > 0 else None
-    cpc = safe_divide(spend, clicks) if clicks > 0 else None
-    cpm = safe_divide(spend, impressions) * 1000 if impressions > 0 else None
-    lead_conversion_rate = safe_divide(leads, clicks) * 100 if clicks > 0 else None
-
-    # Profit
+    # Core metrics. Each ratio is guarded by its denominator inline, so the
+    # zero checks cost a comparison rather than a safe_divide() call.
+    # CPA and CAC are both spend per customer here, so they share one divide,
+    # and ROI reuses the profit figure.
     profit = revenue - spend
+    roi = profit / spend * 100 if spend != 0 else 0.0
+    roas = revenue / spend if spend != 0 else 0.0
+    cpa = cac = spend / customers if customers > 0 else None
+    cpl = spend / leads if leads > 0 else None
+    ctr = clicks / impressions * 100 if impressions > 0 else None
+    cvr = customers / leads * 100 if leads > 0 else None
+    cpc = spend / clicks if clicks > 0 else None
+    cpm = spend / impressions * 1000 if impressions > 0 else None
+    lead_conversion_rate = leads / clicks * 100 if clicks > 0 else None
 
     # Benchmark assessments
     assessments: Dict[str, Any] = {}
     flags: List[str] = []
 
     if ctr is not None:
-        benchmark = get_benchmark("ctr", channel)
-        assessment = assess_performance(ctr, benchmark, higher_is_better=True)
+        benchmark, assessment = assess_metric("ctr", channel, ctr, higher_is_better=True)
         assessments["ctr"] = {
             "value": round(ctr, 2),
-            "benchmark_range": {"low": benchmark[0], "target": benchmark[1], "high": benchmark[2]},
+            "benchmark_range": benchmark_range(benchmark),
             "assessment": assessment,
         }
         if assessment == "underperforming":
             flags.append(f"CTR ({ctr:.2f}%) is below industry low ({benchmark[0]}%) for {channel}")
 
     if roas > 0:
-        benchmark = get_benchmark("roas", channel)
-        assessment = assess_performance(roas, benchmark, higher_is_better=True)
+        benchmark, assessment = assess_metric("roas", channel, roas, higher_is_better=True)
         assessments["roas"] = {
             "value": round(roas, 2),
-            "benchmark_range": {"low": benchmark[0], "target": benchmark[1], "high": benchmark[2]},
+            "benchmark_range": benchmark_range(benchmark),
             "assessment": assessment,
         }
         if assessment == "underperforming":
             flags.append(f"ROAS ({roas:.2f}x) is below industry low ({benchmark[0]}x) for {channel}")
 
     if cpa is not None:
-        benchmark = get_benchmark("cpa", channel)
-        assessment = assess_performance(cpa, benchmark, higher_is_better=False)
+        benchmark, assessment = assess_metric("cpa", channel, cpa, higher_is_better=False)
         assessments["cpa"] = {
             "value": round(cpa, 2),
-            "benchmark_range": {"low": benchmark[0], "target": benchmark[1], "high": benchmark[2]},
+            "benchmark_range": benchmark_range(benchmark),
             "assessment": assessment,
         }
         if assessment == "underperforming":
@@ -189,91 +308,126 @@ def calculate_campaign_metrics(campaign: Dict[str, Any]) -> Dict[str, Any]:
 
     # Recommendations
     recommendations: List[str] = []
-    if ctr is not None and assessments.get("ctr", {}).get("assessment") in ("below_target", "underperforming"):
+    ctr_assessment = assessments.get("ctr", {}).get("assessment")
+    roas_assessment = assessments.get("roas", {}).get("assessment")
+    cpa_assessment = assessments.get("cpa", {}).get("assessment")
+    if ctr is not None and ctr_assessment in ("below_target", "underperforming"):
         recommendations.append("Improve ad creative and targeting to increase CTR")
-    if assessments.get("roas", {}).get("assessment") in ("below_target", "underperforming"):
+    if roas_assessment in ("below_target", "underperforming"):
         recommendations.append("Review targeting and bid strategy to improve ROAS")
-    if assessments.get("cpa", {}).get("assessment") in ("below_target", "underperforming"):
+    if cpa_assessment in ("below_target", "underperforming"):
         recommendations.append("Optimize landing pages and conversion flow to reduce CPA")
     if cvr is not None and cvr < 10:
         recommendations.append("Lead-to-customer conversion is low; review sales process and lead quality")
     if lead_conversion_rate is not None and lead_conversion_rate < 2:
         recommendations.append("Click-to-lead rate is low; improve landing page relevance and form experience")
-    if profit > 0 and assessments.get("roas", {}).get("assessment") in ("good", "excellent"):
+    if profit > 0 and roas_assessment in ("good", "excellent"):
         recommendations.append("Campaign performing well; consider scaling budget")
 
-    return {
-        "name": name,
-        "channel": channel,
-        "metrics": {
-            "spend": round(spend, 2),
-            "revenue": round(revenue, 2),
-            "profit": round(profit, 2),
-            "roi_pct": round(roi, 2),
-            "roas": round(roas, 2),
-            "cpa": round(cpa, 2) if cpa is not None else None,
-            "cpl": round(cpl, 2) if cpl is not None else None,
-            "cac": round(cac, 2) if cac is not None else None,
-            "ctr_pct": round(ctr, 2) if ctr is not None else None,
-            "cvr_pct": round(cvr, 2) if cvr is not None else None,
-            "cpc": round(cpc, 2) if cpc is not None else None,
-            "cpm": round(cpm, 2) if cpm is not None else None,
-            "lead_conversion_rate_pct": round(lead_conversion_rate, 2) if lead_conversion_rate is not None else None,
-            "impressions": impressions,
-            "clicks": clicks,
-            "leads": leads,
-            "customers": customers,
-        },
-        "assessments": assessments,
-        "flags": flags,
-        "recommendations": recommendations,
-    }
+    return CampaignResult(
+        name=name,
+        channel=channel,
+        metrics=CampaignMetrics(
+            spend=spend,
+            revenue=revenue,
+            profit=profit,
+            roi_pct=roi,
+            roas=roas,
+            cpa=cpa,
+            cpl=cpl,
+            cac=cac,
+            ctr_pct=ctr,
+            cvr_pct=cvr,
+            cpc=cpc,
+            cpm=cpm,
+            lead_conversion_rate_pct=lead_conversion_rate,
+            impressions=impressions,
+            clicks=clicks,
+            leads=leads,
+            customers=customers,
+        ),
+        assessments=assessments,
+        flags=flags,
+        recommendations=recommendations,
+    )
+
+
+def calculate_all_campaigns(campaigns: List[Dict[str, Any]]) -> List[CampaignResult]:
+    """Calculate metrics for every campaign, in parallel processes for large portfolios.
+
+    Each campaign is independent, so large inputs are split into chunks and
+    spread across CPU cores; results keep the input order.
+    """
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(campaigns) < PARALLEL_MIN_CAMPAIGNS:
+        return [calculate_campaign_metrics(c) for c in campaigns]
+
+    # Imported here: concurrent.futures pulls in multiprocessing and logging,
+    # which would dominate start-up for the common serial case
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(campaigns) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(calculate_campaign_metrics, campaigns, chunksize=chunksize))
 
 
-def calculate_portfolio_summary(campaign_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+def calculate_portfolio_summary(campaign_results: List[CampaignResult]) -> Dict[str, Any]:
     """Calculate aggregate metrics across all campaigns.
 
     Args:
-        campaign_results: List of individual campaign result dicts.
+        campaign_results: List of individual campaign results.
 
     Returns:
         Portfolio-level summary with totals and weighted averages.
     """
-    total_spend = sum(c["metrics"]["spend"] for c in campaign_results)
-    total_revenue = sum(c["metrics"]["revenue"] for c in campaign_results)
-    total_impressions = sum(c["metrics"]["impressions"] for c in campaign_results)
-    total_clicks = sum(c["metrics"]["clicks"] for c in campaign_results)
-    total_leads = sum(c["metrics"]["leads"] for c in campaign_results)
-    total_customers = sum(c["metrics"]["customers"] for c in campaign_results)
-    total_profit = total_revenue - total_spend
-
-    underperforming = [c["name"] for c in campaign_results if c["flags"]]
-    top_performers = sorted(
-        campaign_results,
-        key=lambda c: c["metrics"]["roi_pct"],
-        reverse=True,
-    )
+    # Single pass over the campaigns. Accumulators start at int 0, as sum()
+    # does, so all-integer inputs keep serializing as integers.
+    total_spend = total_revenue = 0
+    total_impressions = total_clicks = total_leads = total_customers = 0
+    underperforming: List[str] = []
+    top_performer: Optional[str] = None
+    best_roi = float("-inf")
+    # Per-channel [spend, revenue, leads, customers]
+    channel_totals: Dict[str, List[float]] = {}
 
-    # Channel breakdown
-    channel_totals: Dict[str, Dict[str, float]] = {}
     for c in campaign_results:
-        ch = c["channel"]
-        if ch not in channel_totals:
-            channel_totals[ch] = {"spend": 0, "revenue": 0, "leads": 0, "customers": 0}
-        channel_totals[ch]["spend"] += c["metrics"]["spend"]
-        channel_totals[ch]["revenue"] += c["metrics"]["revenue"]
-        channel_totals[ch]["leads"] += c["metrics"]["leads"]
-        channel_totals[ch]["customers"] += c["metrics"]["customers"]
+        m = c.metrics
+        spend = m.spend
+        revenue = m.revenue
+        leads = m.leads
+        customers = m.customers
+        total_spend += spend
+        total_revenue += revenue
+        total_impressions += m.impressions
+        total_clicks += m.clicks
+        total_leads += leads
+        total_customers += customers
+
+        if c.flags:
+            underperforming.append(c.name)
+        if m.roi_pct > best_roi:
+            best_roi = m.roi_pct
+            top_performer = c.name
+
+        totals = channel_totals.get(c.channel)
+        if totals is None:
+            totals = channel_totals[c.channel] = [0, 0, 0, 0]
+        totals[0] += spend
+        totals[1] += revenue
+        totals[2] += leads
+        totals[3] += customers
+
+    total_profit = total_revenue - total_spend
 
     channel_summary = {}
-    for ch, totals in channel_totals.items():
+    for ch, (ch_spend, ch_revenue, ch_leads, ch_customers) in channel_totals.items():
         channel_summary[ch] = {
-            "spend": round(totals["spend"], 2),
-            "revenue": round(totals["revenue"], 2),
-            "roi_pct": round(safe_divide(totals["revenue"] - totals["spend"], totals["spend"]) * 100, 2),
-            "roas": round(safe_divide(totals["revenue"], totals["spend"]), 2),
-            "leads": int(totals["leads"]),
-            "customers": int(totals["customers"]),
+            "spend": round(ch_spend, 2),
+            "revenue": round(ch_revenue, 2),
+            "roi_pct": round(safe_divide(ch_revenue - ch_spend, ch_spend) * 100, 2),
+            "roas": round(safe_divide(ch_revenue, ch_spend), 2),
+            "leads": int(ch_leads),
+            "customers": int(ch_customers),
         }
 
     return {
@@ -291,115 +445,171 @@ def calculate_portfolio_summary(campaign_results: List[Dict[str, Any]]) -> Dict[
         "blended_cpl": round(safe_divide(total_spend, total_leads), 2) if total_leads > 0 else None,
         "blended_cpa": round(safe_divide(total_spend, total_customers), 2) if total_customers > 0 else None,
         "underperforming_campaigns": underperforming,
-        "top_performer": top_performers[0]["name"] if top_performers else None,
+        "top_performer": top_performer,
         "channel_summary": channel_summary,
     }
 
 
-def format_text(results: Dict[str, Any]) -> str:
-    """Format full results as human-readable text."""
-    lines: List[str] = []
-    lines.append("=" * 70)
-    lines.append("CAMPAIGN ROI ANALYSIS")
-    lines.append("=" * 70)
+# Per-campaign metric table rows, formatted with str.format
+_MONEY_ROW = "  {:<25} ${:>13,.2f}"
+_PERCENT_ROW = "  {:<25} {:>13.2f}%"
+_MULTIPLE_ROW = "  {:<25} {:>13.2f}x"
+
+
+def _iter_text_lines(results: Dict[str, Any]) -> Iterator[str]:
+    """Yield the lines of the human-readable report."""
+    yield "=" * 70
+    yield "CAMPAIGN ROI ANALYSIS"
+    yield "=" * 70
 
     # Portfolio summary
     summary = results["portfolio_summary"]
-    lines.append("")
-    lines.append("PORTFOLIO SUMMARY")
-    lines.append(f"  Total Campaigns:    {summary['total_campaigns']}")
-    lines.append(f"  Total Spend:        ${summary['total_spend']:>12,.2f}")
-    lines.append(f"  Total Revenue:      ${summary['total_revenue']:>12,.2f}")
-    lines.append(f"  Total Profit:       ${summary['total_profit']:>12,.2f}")
-    lines.append(f"  Portfolio ROI:      {summary['portfolio_roi_pct']}%")
-    lines.append(f"  Portfolio ROAS:     {summary['portfolio_roas']}x")
-    lines.append(f"  Blended CTR:        {summary['blended_ctr_pct']}%")
+    yield ""
+    yield "PORTFOLIO SUMMARY"
+    yield f"  Total Campaigns:    {summary['total_campaigns']}"
+    yield f"  Total Spend:        ${summary['total_spend']:>12,.2f}"
+    yield f"  Total Revenue:      ${summary['total_revenue']:>12,.2f}"
+    yield f"  Total Profit:       ${summary['total_profit']:>12,.2f}"
+    yield f"  Portfolio ROI:      {summary['portfolio_roi_pct']}%"
+    yield f"  Portfolio ROAS:     {summary['portfolio_roas']}x"
+    yield f"  Blended CTR:        {summary['blended_ctr_pct']}%"
     if summary["blended_cpl"] is not None:
-        lines.append(f"  Blended CPL:        ${summary['blended_cpl']:>12,.2f}")
+        yield f"  Blended CPL:        ${summary['blended_cpl']:>12,.2f}"
     if summary["blended_cpa"] is not None:
-        lines.append(f"  Blended CPA:        ${summary['blended_cpa']:>12,.2f}")
+        yield f"  Blended CPA:        ${summary['blended_cpa']:>12,.2f}"
 
     if summary["top_performer"]:
-        lines.append(f"  Top Performer:      {summary['top_performer']}")
+        yield f"  Top Performer:      {summary['top_performer']}"
     if summary["underperforming_campaigns"]:
-        lines.append(f"  Flagged:            {', '.join(summary['underperforming_campaigns'])}")
+        yield f"  Flagged:            {', '.join(summary['underperforming_campaigns'])}"
 
     # Channel summary
     if summary["channel_summary"]:
-        lines.append("")
-        lines.append("-" * 70)
-        lines.append("CHANNEL SUMMARY")
-        lines.append(f"  {'Channel':<20} {'Spend':>12} {'Revenue':>12} {'ROI':>10} {'ROAS':>8}")
-        lines.append(f"  {'-'*20} {'-'*12} {'-'*12} {'-'*10} {'-'*8}")
+        yield ""
+        yield "-" * 70
+        yield "CHANNEL SUMMARY"
+        yield f"  {'Channel':<20} {'Spend':>12} {'Revenue':>12} {'ROI':>10} {'ROAS':>8}"
+        yield f"  {'-'*20} {'-'*12} {'-'*12} {'-'*10} {'-'*8}"
         for ch, cs in sorted(summary["channel_summary"].items()):
-            lines.append(
+            yield (
                 f"  {ch:<20} ${cs['spend']:>10,.2f} ${cs['revenue']:>10,.2f} "
                 f"{cs['roi_pct']:>8.1f}% {cs['roas']:>6.2f}x"
             )
 
     # Individual campaigns
     for campaign in results["campaigns"]:
-        lines.append("")
-        lines.append("-" * 70)
-        lines.append(f"CAMPAIGN: {campaign['name']}")
-        lines.append(f"Channel: {campaign['channel']}")
-        lines.append("-" * 70)
-
-        m = campaign["metrics"]
-        lines.append(f"  {'Metric':<25} {'Value':>15}")
-        lines.append(f"  {'-'*25} {'-'*15}")
-        lines.append(f"  {'Spend':<25} ${m['spend']:>13,.2f}")
-        lines.append(f"  {'Revenue':<25} ${m['revenue']:>13,.2f}")
-        lines.append(f"  {'Profit':<25} ${m['profit']:>13,.2f}")
-        lines.append(f"  {'ROI':<25} {m['roi_pct']:>13.2f}%")
-        lines.append(f"  {'ROAS':<25} {m['roas']:>13.2f}x")
-
-        if m["cpa"] is not None:
-            lines.append(f"  {'CPA':<25} ${m['cpa']:>13,.2f}")
-        if m["cpl"] is not None:
-            lines.append(f"  {'CPL':<25} ${m['cpl']:>13,.2f}")
-        if m["cac"] is not None:
-            lines.append(f"  {'CAC':<25} ${m['cac']:>13,.2f}")
-        if m["ctr_pct"] is not None:
-            lines.append(f"  {'CTR':<25} {m['ctr_pct']:>13.2f}%")
-        if m["cpc"] is not None:
-            lines.append(f"  {'CPC':<25} ${m['cpc']:>13,.2f}")
-        if m["cpm"] is not None:
-            lines.append(f"  {'CPM':<25} ${m['cpm']:>13,.2f}")
-        if m["cvr_pct"] is not None:
-            lines.append(f"  {'Lead-to-Customer CVR':<25} {m['cvr_pct']:>13.2f}%")
-        if m["lead_conversion_rate_pct"] is not None:
-            lines.append(f"  {'Click-to-Lead Rate':<25} {m['lead_conversion_rate_pct']:>13.2f}%")
+        yield ""
+        yield "-" * 70
+        yield f"CAMPAIGN: {campaign.name}"
+        yield f"Channel: {campaign.channel}"
+        yield "-" * 70
+
+        m = campaign.metrics
+        yield f"  {'Metric':<25} {'Value':>15}"
+        yield f"  {'-'*25} {'-'*15}"
+        yield _MONEY_ROW.format("Spend", m.spend)
+        yield _MONEY_ROW.format("Revenue", m.revenue)
+        yield _MONEY_ROW.format("Profit", m.profit)
+        yield _PERCENT_ROW.format("ROI", m.roi_pct)
+        yield _MULTIPLE_ROW.format("ROAS", m.roas)
+
+        cpa, cpl, cac, ctr = m.cpa, m.cpl, m.cac, m.ctr_pct
+        cpc, cpm, cvr, lead_rate = m.cpc, m.cpm, m.cvr_pct, m.lead_conversion_rate_pct
+        if cpa is not None:
+            yield _MONEY_ROW.format("CPA", cpa)
+        if cpl is not None:
+            yield _MONEY_ROW.format("CPL", cpl)
+        if cac is not None:
+            yield _MONEY_ROW.format("CAC", cac)
+        if ctr is not None:
+            yield _PERCENT_ROW.format("CTR", ctr)
+        if cpc is not None:
+            yield _MONEY_ROW.format("CPC", cpc)
+        if cpm is not None:
+            yield _MONEY_ROW.format("CPM", cpm)
+        if cvr is not None:
+            yield _PERCENT_ROW.format("Lead-to-Customer CVR", cvr)
+        if lead_rate is not None:
+            yield _PERCENT_ROW.format("Click-to-Lead Rate", lead_rate)
 
         # Benchmark assessments
-        if campaign["assessments"]:
-            lines.append("")
-            lines.append("  BENCHMARK ASSESSMENT")
-            for metric_name, a in campaign["assessments"].items():
+        if campaign.assessments:
+            yield ""
+            yield "  BENCHMARK ASSESSMENT"
+            for metric_name, a in campaign.assessments.items():
                 br = a["benchmark_range"]
                 status = a["assessment"].upper().replace("_", " ")
-                lines.append(
+                yield (
                     f"    {metric_name.upper()}: {a['value']} "
                     f"[low={br['low']}, target={br['target']}, high={br['high']}] "
                     f"-> {status}"
                 )
 
         # Flags
-        if campaign["flags"]:
-            lines.append("")
-            lines.append("  WARNING FLAGS")
-            for flag in campaign["flags"]:
-                lines.append(f"    ! {flag}")
+        if campaign.flags:
+            yield ""
+            yield "  WARNING FLAGS"
+            for flag in campaign.flags:
+                yield f"    ! {flag}"
 
         # Recommendations
-        if campaign["recommendations"]:
-            lines.append("")
-            lines.append("  RECOMMENDATIONS")
-            for i, rec in enumerate(campaign["recommendations"], 1):
-                lines.append(f"    {i}. {rec}")
+        if campaign.recommendations:
+            yield ""
+            yield "  RECOMMENDATIONS"
+            for i, rec in enumerate(campaign.recommendations, 1):
+                yield f"    {i}. {rec}"
+
+    yield ""
+
+
+def format_text(results: Dict[str, Any]) -> str:
+    """Format full results as human-readable text."""
+    return "\n".join(_iter_text_lines(results))
+
 
-    lines.append("")
-    return "\n".join(lines)
+def _cache_dir() -> str:
+    """Directory for parsed-input caches, following the XDG convention."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "campaign_roi")
+
+
+def load_campaign_data(path: str, use_cache: bool = False) -> Any:
+    """Load campaign JSON, optionally through an on-disk parsed cache.
+
+    The cache entry is keyed by the file's absolute path, mtime and size, so
+    editing the file invalidates it. Cache read/write failures fall back to
+    parsing the JSON directly.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
+        json.JSONDecodeError: If the input is not valid JSON.
+    """
+    cache_path = None
+    if use_cache:
+        st = os.stat(path)
+        key = f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        cache_path = os.path.join(_cache_dir(), f"{digest}.pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    # Raw bytes let json.loads detect the encoding and decode in one pass
+    with open(path, "rb") as f:
+        data = json.loads(f.read())
+
+    if cache_path is not None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return data
 
 
 def main() -> None:
@@ -419,13 +629,17 @@ def main() -> None:
         dest="output_format",
         help="Output format (default: text)",
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the parsed input from ~/.cache/campaign_roi while the file is unchanged",
+    )
 
     args = parser.parse_args()
 
     # Load input data
     try:
-        with open(args.input_file, "r") as f:
-            data = json.load(f)
+        data = load_campaign_data(args.input_file, use_cache=args.cache)
     except FileNotFoundError:
         print(f"Error: File not found: {args.input_file}", file=sys.stderr)
         sys.exit(1)
@@ -439,7 +653,7 @@ def main() -> None:
         sys.exit(1)
 
     # Calculate metrics for each campaign
-    campaign_results = [calculate_campaign_metrics(c) for c in campaigns]
+    campaign_results = calculate_all_campaigns(campaigns)
 
     # Calculate portfolio summary
     portfolio_summary = calculate_portfolio_summary(campaign_results)
@@ -450,7 +664,9 @@ def main() -> None:
     }
 
     if args.output_format == "json":
-        print(json.dumps(results, indent=2))
+        # Stream the encoder's chunks instead of building one large string
+        json.dump(results, sys.stdout, indent=2, default=_to_json)
+        sys.stdout.write("\n")
     else:
         print(format_text(results))
 
@@ -16,7 +16,48 @@ Usage:
 import argparse
 import json
 import sys
-from typing import Any, Dict, List, Optional
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class FunnelStage:
+    """Metrics for one funnel stage; from_previous is None for the entry stage."""
+
+    __slots__ = (
+        "stage", "count", "cumulative_conversion", "from_previous",
+        "conversion_rate", "dropoff_count", "dropoff_rate",
+    )
+
+    stage: str
+    count: int
+    cumulative_conversion: float
+    from_previous: Optional[str]
+    conversion_rate: float
+    dropoff_count: int
+    dropoff_rate: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the stage as a plain dict in output field order."""
+        data: Dict[str, Any] = {
+            "stage": self.stage,
+            "count": self.count,
+            "cumulative_conversion": self.cumulative_conversion,
+        }
+        if self.from_previous is not None:
+            data["from_previous"] = self.from_previous
+        data["conversion_rate"] = self.conversion_rate
+        data["dropoff_count"] = self.dropoff_count
+        data["dropoff_rate"] = self.dropoff_rate
+        return data
+
+
+def _to_json(obj: Any) -> Any:
+    """json.dump hook: convert FunnelStage objects to dicts while encoding."""
+    if isinstance(obj, FunnelStage):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
@@ -26,7 +67,52 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     return numerator / denominator
 
 
-def analyze_funnel(stages: List[str], counts: List[int]) -> Dict[str, Any]:
+def as_count_array(counts: Sequence[int]) -> Sequence[int]:
+    """Pack stage counts into a contiguous int64 array.
+
+    Counts that do not fit (floats, values beyond 64 bits) are returned as a
+    list so the analysis still accepts them.
+    """
+    if isinstance(counts, array):
+        return counts
+    try:
+        return array("q", counts)
+    except (TypeError, OverflowError):
+        return list(counts)
+
+
+def _funnel_kernel(counts: Sequence[int]) -> Tuple[List[float], List[int], List[float], int, int]:
+    """Compute the numeric stage-to-stage metrics for a funnel.
+
+    Kept free of dict building: every metric is one element-wise pass over
+    the (previous, current) count pairs, and the bottlenecks are found with
+    max() rather than compare-and-branch bookkeeping.
+
+    Returns:
+        Tuple of (conversion_rates, dropoff_counts, dropoff_rates,
+        bottleneck_abs_index, bottleneck_rel_index). Index 0 describes the
+        entry stage; a bottleneck index of -1 means no stage lost entries.
+    """
+    pairs = list(zip(counts, counts[1:]))
+    conversion_rates = [100.0] + [count / prev * 100 if prev != 0 else 0.0 for prev, count in pairs]
+    dropoff_counts = [0] + [prev - count for prev, count in pairs]
+    dropoff_rates = [0.0] + [100 - rate for rate in conversion_rates[1:]]
+
+    # max() returns the first maximum, matching a strict ">" scan
+    idx_abs = idx_rel = -1
+    if pairs:
+        stage_indices = range(1, len(counts))
+        best = max(stage_indices, key=dropoff_counts.__getitem__)
+        if dropoff_counts[best] > 0:
+            idx_abs = best
+        best = max(stage_indices, key=dropoff_rates.__getitem__)
+        if dropoff_rates[best] > 0.0:
+            idx_rel = best
+
+    return conversion_rates, dropoff_counts, dropoff_rates, idx_abs, idx_rel
+
+
+def analyze_funnel(stages: List[str], counts: Sequence[int]) -> Dict[str, Any]:
     """Analyze a single funnel and return stage-by-stage metrics.
 
     Args:
@@ -34,68 +120,58 @@ def analyze_funnel(stages: List[str], counts: List[int]) -> Dict[str, Any]:
         counts: Corresponding counts at each stage.
 
     Returns:
-        Dictionary with stage metrics, bottleneck info, and overall conversion.
+        Dictionary with stage metrics (FunnelStage objects), bottleneck info,
+        and overall conversion.
     """
     if len(stages) != len(counts):
         raise ValueError("Number of stages must match number of counts.")
     if not stages:
         raise ValueError("Funnel must have at least one stage.")
 
-    stage_metrics: List[Dict[str, Any]] = []
-    max_dropoff_abs = 0
-    max_dropoff_rel = 0.0
-    bottleneck_abs: Optional[str] = None
-    bottleneck_rel: Optional[str] = None
-
-    for i, (stage, count) in enumerate(zip(stages, counts)):
-        metric: Dict[str, Any] = {
-            "stage": stage,
-            "count": count,
-            "cumulative_conversion": round(safe_divide(count, counts[0]) * 100, 2),
-        }
-
-        if i > 0:
-            prev_count = counts[i - 1]
-            dropoff = prev_count - count
-            conversion_rate = safe_divide(count, prev_count) * 100
-            dropoff_rate = 100 - conversion_rate
-
-            metric["from_previous"] = stages[i - 1]
-            metric["conversion_rate"] = round(conversion_rate, 2)
-            metric["dropoff_count"] = dropoff
-            metric["dropoff_rate"] = round(dropoff_rate, 2)
-
-            # Track biggest absolute drop-off
-            if dropoff > max_dropoff_abs:
-                max_dropoff_abs = dropoff
-                bottleneck_abs = f"{stages[i-1]} -> {stage}"
-
-            # Track biggest relative drop-off
-            if dropoff_rate > max_dropoff_rel:
-                max_dropoff_rel = dropoff_rate
-                bottleneck_rel = f"{stages[i-1]} -> {stage}"
-        else:
-            metric["conversion_rate"] = 100.0
-            metric["dropoff_count"] = 0
-            metric["dropoff_rate"] = 0.0
-
-        stage_metrics.append(metric)
+    counts = as_count_array(counts)
+    conversion_rates, dropoff_counts, dropoff_rates, idx_abs, idx_rel = _funnel_kernel(counts)
+    first_count = counts[0]
+
+    stage_metrics: List[FunnelStage] = [
+        FunnelStage(
+            stage=stages[0],
+            count=first_count,
+            cumulative_conversion=round(safe_divide(first_count, first_count) * 100, 2),
+            from_previous=None,
+            conversion_rate=100.0,
+            dropoff_count=0,
+            dropoff_rate=0.0,
+        )
+    ]
+    for i in range(1, len(stages)):
+        count = counts[i]
+        stage_metrics.append(
+            FunnelStage(
+                stage=stages[i],
+                count=count,
+                cumulative_conversion=round(safe_divide(count, first_count) * 100, 2),
+                from_previous=stages[i - 1],
+                conversion_rate=round(conversion_rates[i], 2),
+                dropoff_count=dropoff_counts[i],
+                dropoff_rate=round(dropoff_rates[i], 2),
+            )
+        )
 
-    overall_conversion = safe_divide(counts[-1], counts[0]) * 100
+    overall_conversion = safe_divide(counts[-1], first_count) * 100
 
     return {
         "stage_metrics": stage_metrics,
         "overall_conversion_rate": round(overall_conversion, 2),
-        "total_entries": counts[0],
+        "total_entries": first_count,
         "total_conversions": counts[-1],
-        "total_lost": counts[0] - counts[-1],
+        "total_lost": first_count - counts[-1],
         "bottleneck_absolute": {
-            "transition": bottleneck_abs,
-            "dropoff_count": max_dropoff_abs,
+            "transition": f"{stages[idx_abs - 1]} -> {stages[idx_abs]}" if idx_abs > 0 else None,
+            "dropoff_count": dropoff_counts[idx_abs] if idx_abs > 0 else 0,
         },
         "bottleneck_relative": {
-            "transition": bottleneck_rel,
-            "dropoff_rate": round(max_dropoff_rel, 2),
+            "transition": f"{stages[idx_rel - 1]} -> {stages[idx_rel]}" if idx_rel > 0 else None,
+            "dropoff_rate": round(dropoff_rates[idx_rel], 2) if idx_rel > 0 else 0.0,
         },
     }
 
@@ -118,7 +194,7 @@ def compare_segments(segments: Dict[str, Dict[str, Any]], stages: List[str]) ->
             raise ValueError(
                 f"Segment '{seg_name}' has {len(counts)} counts but {len(stages)} stages."
             )
-        segment_results[seg_name] = analyze_funnel(stages, counts)
+        segment_results[seg_name] = analyze_funnel(stages, as_count_array(counts))
 
     # Rank segments by overall conversion rate
     ranked = sorted(
@@ -138,14 +214,16 @@ def compare_segments(segments: Dict[str, Dict[str, Any]], stages: List[str]) ->
     ]
 
     # Stage-by-stage comparison
+    # Resolve each segment's stage list once instead of per (stage, segment)
+    seg_columns = [(seg_name, result["stage_metrics"]) for seg_name, result in segment_results.items()]
     stage_comparison: List[Dict[str, Any]] = []
     for i, stage in enumerate(stages):
         stage_data: Dict[str, Any] = {"stage": stage}
-        for seg_name in segments:
-            metrics = segment_results[seg_name]["stage_metrics"][i]
+        for seg_name, seg_metrics in seg_columns:
+            metrics = seg_metrics[i]
             stage_data[seg_name] = {
-                "count": metrics["count"],
-                "conversion_rate": metrics["conversion_rate"],
+                "count": metrics.count,
+                "conversion_rate": metrics.conversion_rate,
             }
         stage_comparison.append(stage_data)
 
@@ -171,11 +249,11 @@ def format_single_funnel_text(analysis: Dict[str, Any], title: str = "FUNNEL") -
     lines.append(f"  {'-'*20} {'-'*10} {'-'*12} {'-'*12} {'-'*12}")
 
     for m in analysis["stage_metrics"]:
-        stage = m["stage"]
-        count = m["count"]
-        conv = f"{m['conversion_rate']:.1f}%"
-        drop = f"-{m['dropoff_count']:,} ({m['dropoff_rate']:.1f}%)" if m["dropoff_count"] > 0 else "-"
-        cumul = f"{m['cumulative_conversion']:.1f}%"
+        stage = m.stage
+        count = m.count
+        conv = f"{m.conversion_rate:.1f}%"
+        drop = f"-{m.dropoff_count:,} ({m.dropoff_rate:.1f}%)" if m.dropoff_count > 0 else "-"
+        cumul = f"{m.cumulative_conversion:.1f}%"
         lines.append(f"  {stage:<20} {count:>10,} {conv:>12} {drop:>12} {cumul:>12}")
 
     lines.append("")
@@ -261,8 +339,9 @@ def main() -> None:
 
     # Load input data
     try:
-        with open(args.input_file, "r") as f:
-            data = json.load(f)
+        # Raw bytes let json.loads detect the encoding and decode in one pass
+        with open(args.input_file, "rb") as f:
+            data = json.loads(f.read())
     except FileNotFoundError:
         print(f"Error: File not found: {args.input_file}", file=sys.stderr)
         sys.exit(1)
@@ -296,7 +375,9 @@ def main() -> None:
         sys.exit(1)
 
     if args.output_format == "json":
-        print(json.dumps(results, indent=2))
+        # Stream the encoder's chunks instead of building one large string
+        json.dump(results, sys.stdout, indent=2, default=_to_json)
+        sys.stdout.write("\n")
     else:
         print(format_text(results))
 
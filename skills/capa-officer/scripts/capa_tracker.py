@@ -14,10 +14,40 @@ Usage:
 import argparse
 import json
 import sys
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 from enum import Enum
+from operator import attrgetter, countOf
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib parser is used otherwise
+    orjson = None
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD date, slicing the fixed layout before using strptime."""
+    if (len(value) == 10 and value[4] == "-" and value[7] == "-"
+            and value[:4].isdigit() and value[5:7].isdigit() and value[8:].isdigit()):
+        try:
+            return datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+        except ValueError:
+            pass
+    # Unpadded or otherwise unusual input keeps strptime's parsing and errors
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+# Aging-report buckets: upper bound (inclusive) in days and label
+_AGING_LIMITS = (30, 60, 90, 120)
+_AGING_LABELS = ("0-30 days", "31-60 days", "61-90 days", "91-120 days", ">120 days")
+
+
+def _aging_bucket(days: int) -> str:
+    """Return the aging-report bucket label for a number of days open."""
+    return _AGING_LABELS[bisect_left(_AGING_LIMITS, days)]
 
 
 class CAPAStatus(Enum):
@@ -47,7 +77,28 @@ class CAPASource(Enum):
     OTHER = "Other"
 
 
-@dataclass
+# Display strings per enum member, looked up instead of the .value descriptor
+_STATUS_VALUES = {m: m.value for m in CAPAStatus}
+_SEVERITY_VALUES = {m: m.value for m in CAPASeverity}
+
+# Enum members by name, for parsing JSON input without Enum.__getitem__
+_STATUS_BY_NAME = {m.name: m for m in CAPAStatus}
+_SEVERITY_BY_NAME = {m.name: m for m in CAPASeverity}
+_SOURCE_BY_NAME = {m.name: m for m in CAPASource}
+
+# Slot-backed records where dataclasses support it (Python 3.10+); CAPA has
+# field defaults, which rule out a hand-written __slots__ on older versions
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_OPEN_STATUSES = frozenset({
+    CAPAStatus.OPEN, CAPAStatus.INVESTIGATION,
+    CAPAStatus.ACTION_PLANNING, CAPAStatus.IMPLEMENTATION,
+    CAPAStatus.VERIFICATION
+})
+_CLOSED_STATUSES = frozenset({CAPAStatus.CLOSED_EFFECTIVE, CAPAStatus.CLOSED_INEFFECTIVE})
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class CAPA:
     capa_number: str
     title: str
@@ -64,9 +115,23 @@ class CAPA:
     close_date: Optional[str] = None
     days_open: int = 0
     is_overdue: bool = False
+    # Parsed dates and overdue days, filled in once by CAPATracker
+    _open_dt: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    _target_dt: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    _close_dt: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    _days_overdue: int = field(default=0, init=False, repr=False, compare=False)
+
+
+class OverdueRow(NamedTuple):
+    capa_number: str
+    title: str
+    severity: str
+    status: str
+    days_overdue: int
+    owner: str
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class CAPAMetrics:
     total_capas: int
     open_capas: int
@@ -77,7 +142,7 @@ class CAPAMetrics:
     by_status: Dict[str, int]
     by_severity: Dict[str, int]
     by_source: Dict[str, int]
-    overdue_list: List[Dict]
+    overdue_list: List[OverdueRow]
     recommendations: List[str]
 
 
@@ -97,29 +162,71 @@ class CAPATracker:
         self._calculate_derived_fields()
 
     def _calculate_derived_fields(self):
-        """Calculate days open and overdue status."""
-        for capa in self.capas:
-            open_date = datetime.strptime(capa.open_date, "%Y-%m-%d")
+        """Calculate days open, overdue status and the open-CAPA aging buckets."""
+        self._aging_buckets = aging_buckets = {label: [] for label in _AGING_LABELS}
 
-            if capa.close_date:
-                close_date = datetime.strptime(capa.close_date, "%Y-%m-%d")
-                capa.days_open = (close_date - open_date).days
-            else:
-                capa.days_open = (self.today - open_date).days
+        # Bound once; the loop body runs per CAPA
+        today = self.today
+        parse_date = _parse_date
+        aging_bucket = _aging_bucket
+        open_statuses = _OPEN_STATUSES
+        status_values = _STATUS_VALUES
+        severity_values = _SEVERITY_VALUES
 
-            target_date = datetime.strptime(capa.target_date, "%Y-%m-%d")
-            if not capa.close_date and self.today > target_date:
-                capa.is_overdue = True
+        for capa in self.capas:
+            open_date = parse_date(capa.open_date)
+            target_date = parse_date(capa.target_date)
+            capa._open_dt = open_date
+            capa._target_dt = target_date
+
+            close_date_str = capa.close_date
+            if close_date_str:
+                close_date = parse_date(close_date_str)
+                capa._close_dt = close_date
+                days = (close_date - open_date).days
+            else:
+                days = (today - open_date).days
+                if today > target_date:
+                    capa.is_overdue = True
+                    capa._days_overdue = (today - target_date).days
+            capa.days_open = days
+
+            status = capa.status
+            if status in open_statuses:
+                aging_buckets[aging_bucket(days)].append({
+                    "capa_number": capa.capa_number,
+                    "title": capa.title,
+                    "days_open": days,
+                    "status": status_values[status],
+                    "severity": severity_values[capa.severity]
+                })
 
     def calculate_metrics(self) -> CAPAMetrics:
         """Calculate comprehensive CAPA metrics."""
         total = len(self.capas)
 
-        # Status counts
-        closed_statuses = [CAPAStatus.CLOSED_EFFECTIVE, CAPAStatus.CLOSED_INEFFECTIVE]
-        open_capas = [c for c in self.capas if c.status not in closed_statuses]
-        closed_capas = [c for c in self.capas if c.status in closed_statuses]
-        overdue_capas = [c for c in self.capas if c.is_overdue]
+        # Category counts are tallied by Counter's C loop; the open/closed/
+        # overdue split is one Python pass
+        status_counts = Counter(map(attrgetter("status"), self.capas))
+        severity_counts = Counter(map(attrgetter("severity"), self.capas))
+        source_counts = Counter(map(attrgetter("source"), self.capas))
+        effective = status_counts[CAPAStatus.CLOSED_EFFECTIVE]
+        ineffective = status_counts[CAPAStatus.CLOSED_INEFFECTIVE]
+
+        open_capas = []
+        closed_capas = []
+        overdue_capas = []
+        closed_statuses = _CLOSED_STATUSES
+        add_open = open_capas.append
+        add_closed = closed_capas.append
+        add_overdue = overdue_capas.append
+        for capa in self.capas:
+            if capa.status in closed_statuses:
+                add_closed(capa)
+            else:
+                add_open(capa)
+            if capa.is_overdue:
+                add_overdue(capa)
 
         # Average cycle time (closed CAPAs only)
         if closed_capas:
@@ -128,49 +235,34 @@ class CAPATracker:
             avg_cycle = 0.0
 
         # Effectiveness rate
-        effective = [c for c in self.capas if c.status == CAPAStatus.CLOSED_EFFECTIVE]
-        ineffective = [c for c in self.capas if c.status == CAPAStatus.CLOSED_INEFFECTIVE]
         if effective or ineffective:
-            effectiveness = len(effective) / (len(effective) + len(ineffective)) * 100
+            effectiveness = effective / (effective + ineffective) * 100
         else:
             effectiveness = 0.0
 
-        # Counts by category
-        by_status = {}
-        for status in CAPAStatus:
-            count = len([c for c in self.capas if c.status == status])
-            if count > 0:
-                by_status[status.value] = count
-
-        by_severity = {}
-        for severity in CAPASeverity:
-            count = len([c for c in self.capas if c.severity == severity])
-            if count > 0:
-                by_severity[severity.value] = count
-
-        by_source = {}
-        for source in CAPASource:
-            count = len([c for c in self.capas if c.source == source])
-            if count > 0:
-                by_source[source.value] = count
+        # Counts by category, in enum declaration order
+        by_status = {s.value: status_counts[s] for s in CAPAStatus if status_counts[s]}
+        by_severity = {s.value: severity_counts[s] for s in CAPASeverity if severity_counts[s]}
+        by_source = {s.value: source_counts[s] for s in CAPASource if source_counts[s]}
 
         # Overdue list
-        overdue_list = []
-        for capa in sorted(overdue_capas, key=lambda c: c.days_open, reverse=True):
-            target = datetime.strptime(capa.target_date, "%Y-%m-%d")
-            days_overdue = (self.today - target).days
-            overdue_list.append({
-                "capa_number": capa.capa_number,
-                "title": capa.title,
-                "severity": capa.severity.value,
-                "status": capa.status.value,
-                "days_overdue": days_overdue,
-                "owner": capa.owner
-            })
+        # Most overdue first
+        overdue_list = [
+            OverdueRow(
+                capa.capa_number,
+                capa.title,
+                _SEVERITY_VALUES[capa.severity],
+                _STATUS_VALUES[capa.status],
+                capa._days_overdue,
+                capa.owner,
+            )
+            for capa in sorted(overdue_capas, key=attrgetter("_days_overdue"), reverse=True)
+        ]
 
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            open_capas, overdue_capas, effectiveness, avg_cycle
+            open_capas, overdue_capas, effectiveness, avg_cycle,
+            status_counts, source_counts
         )
 
         return CAPAMetrics(
@@ -192,17 +284,23 @@ class CAPATracker:
         open_capas: List[CAPA],
         overdue_capas: List[CAPA],
         effectiveness: float,
-        avg_cycle: float
+        avg_cycle: float,
+        status_counts: Dict[CAPAStatus, int],
+        source_counts: Dict[CAPASource, int]
     ) -> List[str]:
-        """Generate actionable recommendations."""
+        """Generate actionable recommendations.
+
+        The status and source tallies from calculate_metrics stand in for
+        re-filtering the CAPA list by those attributes.
+        """
         recommendations = []
 
         # Overdue CAPAs
         if overdue_capas:
-            critical_overdue = [c for c in overdue_capas if c.severity == CAPASeverity.CRITICAL]
+            critical_overdue = countOf(map(attrgetter("severity"), overdue_capas), CAPASeverity.CRITICAL)
             if critical_overdue:
                 recommendations.append(
-                    f"URGENT: {len(critical_overdue)} critical CAPA(s) overdue. "
+                    f"URGENT: {critical_overdue} critical CAPA(s) overdue. "
                     "Escalate to management immediately."
                 )
             else:
@@ -226,25 +324,26 @@ class CAPATracker:
             )
 
         # Investigation backlog
-        in_investigation = [c for c in open_capas if c.status == CAPAStatus.INVESTIGATION]
-        if len(in_investigation) > 5:
+        in_investigation = status_counts.get(CAPAStatus.INVESTIGATION, 0)
+        if in_investigation > 5:
             recommendations.append(
-                f"WORKLOAD: {len(in_investigation)} CAPAs in investigation phase. "
+                f"WORKLOAD: {in_investigation} CAPAs in investigation phase. "
                 "Consider additional resources or prioritization."
             )
 
         # Stuck in verification
-        in_verification = [c for c in open_capas if c.status == CAPAStatus.VERIFICATION]
-        old_verification = [c for c in in_verification if c.days_open > 120]
+        old_verification = sum(
+            1 for c in open_capas if c.status == CAPAStatus.VERIFICATION and c.days_open > 120
+        )
         if old_verification:
             recommendations.append(
-                f"STALLED: {len(old_verification)} CAPA(s) in verification >120 days. "
+                f"STALLED: {old_verification} CAPA(s) in verification >120 days. "
                 "Complete effectiveness checks or extend with justification."
             )
 
         # Source patterns
-        complaint_capas = [c for c in self.capas if c.source == CAPASource.COMPLAINT]
-        if len(complaint_capas) > len(self.capas) * 0.4:
+        complaint_capas = source_counts.get(CAPASource.COMPLAINT, 0)
+        if complaint_capas > len(self.capas) * 0.4:
             recommendations.append(
                 "TREND: >40% of CAPAs from customer complaints. "
                 "Review preventive action effectiveness and quality controls."
@@ -259,44 +358,19 @@ class CAPATracker:
         return recommendations
 
     def get_aging_report(self) -> Dict:
-        """Generate aging analysis of open CAPAs."""
-        open_statuses = [
-            CAPAStatus.OPEN, CAPAStatus.INVESTIGATION,
-            CAPAStatus.ACTION_PLANNING, CAPAStatus.IMPLEMENTATION,
-            CAPAStatus.VERIFICATION
-        ]
-        open_capas = [c for c in self.capas if c.status in open_statuses]
-
-        aging_buckets = {
-            "0-30 days": [],
-            "31-60 days": [],
-            "61-90 days": [],
-            "91-120 days": [],
-            ">120 days": []
-        }
+        """Return the aging analysis of open CAPAs built with the derived fields."""
+        return self._aging_buckets
 
-        for capa in open_capas:
-            days = capa.days_open
-            if days <= 30:
-                bucket = "0-30 days"
-            elif days <= 60:
-                bucket = "31-60 days"
-            elif days <= 90:
-                bucket = "61-90 days"
-            elif days <= 120:
-                bucket = "91-120 days"
-            else:
-                bucket = ">120 days"
 
-            aging_buckets[bucket].append({
-                "capa_number": capa.capa_number,
-                "title": capa.title,
-                "days_open": days,
-                "status": capa.status.value,
-                "severity": capa.severity.value
-            })
+# Widest distribution bar; shorter bars are slices of it
+_FULL_BAR = "█" * 20
 
-        return aging_buckets
+
+def _emit_distribution(lines: List[str], title: str, counts: Dict[str, int]) -> None:
+    """Append a titled bar-chart section for a category distribution."""
+    lines.extend(["", title, "-" * 40])
+    for name, count in counts.items():
+        lines.append(f"  {name:<25} {_FULL_BAR[:count]} {count}")
 
 
 def format_text_output(metrics: CAPAMetrics, aging: Dict) -> str:
@@ -315,34 +389,11 @@ def format_text_output(metrics: CAPAMetrics, aging: Dict) -> str:
         f"Overdue CAPAs:      {metrics.overdue_capas}",
         f"Avg Cycle Time:     {metrics.avg_cycle_time} days",
         f"Effectiveness Rate: {metrics.effectiveness_rate}%",
-        "",
-        "STATUS DISTRIBUTION",
-        "-" * 40,
     ]
 
-    for status, count in metrics.by_status.items():
-        bar = "█" * min(count, 20)
-        lines.append(f"  {status:<25} {bar} {count}")
-
-    lines.extend([
-        "",
-        "SEVERITY DISTRIBUTION",
-        "-" * 40,
-    ])
-
-    for severity, count in metrics.by_severity.items():
-        bar = "█" * min(count, 20)
-        lines.append(f"  {severity:<25} {bar} {count}")
-
-    lines.extend([
-        "",
-        "SOURCE DISTRIBUTION",
-        "-" * 40,
-    ])
-
-    for source, count in metrics.by_source.items():
-        bar = "█" * min(count, 20)
-        lines.append(f"  {source:<25} {bar} {count}")
+    _emit_distribution(lines, "STATUS DISTRIBUTION", metrics.by_status)
+    _emit_distribution(lines, "SEVERITY DISTRIBUTION", metrics.by_severity)
+    _emit_distribution(lines, "SOURCE DISTRIBUTION", metrics.by_source)
 
     lines.extend([
         "",
@@ -363,10 +414,9 @@ def format_text_output(metrics: CAPAMetrics, aging: Dict) -> str:
         ])
 
         for item in metrics.overdue_list[:10]:
-            title = item["title"][:24] if len(item["title"]) > 24 else item["title"]
             lines.append(
-                f"{item['capa_number']:<12} {title:<25} "
-                f"{item['days_overdue']:<6} {item['owner']:<15}"
+                f"{item.capa_number:<12} {item.title[:24]:<25} "
+                f"{item.days_overdue:<6} {item.owner:<15}"
             )
 
         if len(metrics.overdue_list) > 10:
@@ -385,6 +435,31 @@ def format_text_output(metrics: CAPAMetrics, aging: Dict) -> str:
     return "\n".join(lines)
 
 
+# Single-letter answers accepted by interactive mode
+_SOURCE_BY_KEY = {
+    "C": CAPASource.COMPLAINT,
+    "A": CAPASource.AUDIT,
+    "N": CAPASource.NONCONFORMANCE,
+    "M": CAPASource.MANAGEMENT_REVIEW,
+    "T": CAPASource.TREND_ANALYSIS,
+    "O": CAPASource.OTHER
+}
+_SEVERITY_BY_KEY = {
+    "C": CAPASeverity.CRITICAL,
+    "M": CAPASeverity.MAJOR,
+    "I": CAPASeverity.MINOR
+}
+_STATUS_BY_KEY = {
+    "O": CAPAStatus.OPEN,
+    "I": CAPAStatus.INVESTIGATION,
+    "P": CAPAStatus.ACTION_PLANNING,
+    "M": CAPAStatus.IMPLEMENTATION,
+    "V": CAPAStatus.VERIFICATION,
+    "E": CAPAStatus.CLOSED_EFFECTIVE,
+    "N": CAPAStatus.CLOSED_INEFFECTIVE
+}
+
+
 def interactive_mode():
     """Run interactive CAPA entry mode."""
     print("=" * 60)
@@ -404,44 +479,22 @@ def interactive_mode():
 
         print("Source options: C=Complaint, A=Audit, N=Nonconformance, M=Management Review, T=Trend, O=Other")
         source_input = input("Source [C/A/N/M/T/O]: ").strip().upper()
-        source_map = {
-            "C": CAPASource.COMPLAINT,
-            "A": CAPASource.AUDIT,
-            "N": CAPASource.NONCONFORMANCE,
-            "M": CAPASource.MANAGEMENT_REVIEW,
-            "T": CAPASource.TREND_ANALYSIS,
-            "O": CAPASource.OTHER
-        }
-        source = source_map.get(source_input, CAPASource.OTHER)
+        source = _SOURCE_BY_KEY.get(source_input, CAPASource.OTHER)
 
         print("Severity: C=Critical, M=Major, I=Minor")
         severity_input = input("Severity [C/M/I]: ").strip().upper()
-        severity_map = {
-            "C": CAPASeverity.CRITICAL,
-            "M": CAPASeverity.MAJOR,
-            "I": CAPASeverity.MINOR
-        }
-        severity = severity_map.get(severity_input, CAPASeverity.MINOR)
+        severity = _SEVERITY_BY_KEY.get(severity_input, CAPASeverity.MINOR)
 
         print("Status: O=Open, I=Investigation, P=Action Planning, M=Implementation, V=Verification, E=Closed Effective, N=Closed Ineffective")
         status_input = input("Status [O/I/P/M/V/E/N]: ").strip().upper()
-        status_map = {
-            "O": CAPAStatus.OPEN,
-            "I": CAPAStatus.INVESTIGATION,
-            "P": CAPAStatus.ACTION_PLANNING,
-            "M": CAPAStatus.IMPLEMENTATION,
-            "V": CAPAStatus.VERIFICATION,
-            "E": CAPAStatus.CLOSED_EFFECTIVE,
-            "N": CAPAStatus.CLOSED_INEFFECTIVE
-        }
-        status = status_map.get(status_input, CAPAStatus.OPEN)
+        status = _STATUS_BY_KEY.get(status_input, CAPAStatus.OPEN)
 
         open_date = input("Open Date (YYYY-MM-DD): ").strip()
         target_date = input("Target Date (YYYY-MM-DD): ").strip()
         owner = input("Owner: ").strip()
 
         close_date = None
-        if status in [CAPAStatus.CLOSED_EFFECTIVE, CAPAStatus.CLOSED_INEFFECTIVE]:
+        if status in _CLOSED_STATUSES:
             close_date = input("Close Date (YYYY-MM-DD): ").strip()
 
         capas.append(CAPA(
@@ -546,25 +599,15 @@ def main():
         return
 
     if args.capas:
-        with open(args.capas, "r") as f:
-            data = json.load(f)
+        with open(args.capas, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
         capas = []
         for c in data.get("capas", []):
-            try:
-                source = CAPASource[c.get("source", "OTHER").upper()]
-            except KeyError:
-                source = CAPASource.OTHER
-
-            try:
-                severity = CAPASeverity[c.get("severity", "MINOR").upper()]
-            except KeyError:
-                severity = CAPASeverity.MINOR
-
-            try:
-                status = CAPAStatus[c.get("status", "OPEN").upper()]
-            except KeyError:
-                status = CAPAStatus.OPEN
+            source = _SOURCE_BY_NAME.get(c.get("source", "OTHER").upper(), CAPASource.OTHER)
+            severity = _SEVERITY_BY_NAME.get(c.get("severity", "MINOR").upper(), CAPASeverity.MINOR)
+            status = _STATUS_BY_NAME.get(c.get("status", "OPEN").upper(), CAPAStatus.OPEN)
 
             capas.append(CAPA(
                 capa_number=c["capa_number"],
@@ -625,8 +668,11 @@ def main():
     aging = tracker.get_aging_report()
 
     if args.output == "json":
+        metrics_dict = asdict(metrics)
+        # Rows are tuples to asdict(); serialize them as objects
+        metrics_dict["overdue_list"] = [row._asdict() for row in metrics.overdue_list]
         output = {
-            "metrics": asdict(metrics),
+            "metrics": metrics_dict,
             "aging": aging
         }
         print(json.dumps(output, indent=2))
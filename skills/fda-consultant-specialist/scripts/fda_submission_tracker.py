@@ -9,16 +9,25 @@ Usage:
     python fda_submission_tracker.py <project_dir>
     python fda_submission_tracker.py <project_dir> --type 510k
     python fda_submission_tracker.py <project_dir> --json
+    python fda_submission_tracker.py <project_dir> --no-readiness
 """
 
 import argparse
+import fnmatch
 import json
 import os
+import re
 import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib parser is used otherwise
+    orjson = None
+
 
 # FDA review timeline targets (calendar days)
 FDA_TIMELINES = {
@@ -101,22 +110,101 @@ MILESTONES = {
     ]
 }
 
+# Milestone entries with "optional" filled in, so per-call status dicts only
+# add the completion fields
+_MILESTONE_TEMPLATES = {
+    key: tuple(
+        {"id": m["id"], "name": m["name"], "phase": m["phase"], "optional": m.get("optional", False)}
+        for m in milestones
+    )
+    for key, milestones in MILESTONES.items()
+}
+
+# Bit per milestone phase, for tracking completed phases as a mask
+_PHASE_BITS = {"planning": 1, "preparation": 2, "submission": 4, "review": 8, "decision": 16}
+
+# Documentation expected for each submission type, matched by filename pattern
+REQUIRED_DOCS = {
+    "510k": [
+        {"name": "Device Description", "patterns": ["device_description*", "device_desc*"]},
+        {"name": "Indications for Use", "patterns": ["indications*", "ifu*"]},
+        {"name": "Substantial Equivalence", "patterns": ["substantial_equiv*", "se_comparison*", "predicate*"]},
+        {"name": "Performance Testing", "patterns": ["performance*", "test_report*", "bench_test*"]},
+        {"name": "Biocompatibility", "patterns": ["biocompat*", "iso_10993*"]},
+        {"name": "Labeling", "patterns": ["label*", "ifu*", "instructions*"]},
+        {"name": "Software Documentation", "patterns": ["software*", "iec_62304*"], "optional": True},
+        {"name": "Sterilization Validation", "patterns": ["steriliz*", "sterility*"], "optional": True}
+    ],
+    "de_novo": [
+        {"name": "Device Description", "patterns": ["device_description*", "device_desc*"]},
+        {"name": "Risk Assessment", "patterns": ["risk*", "hazard*"]},
+        {"name": "Special Controls", "patterns": ["special_control*"]},
+        {"name": "Performance Testing", "patterns": ["performance*", "test_report*"]},
+        {"name": "Labeling", "patterns": ["label*", "ifu*"]}
+    ],
+    "pma": [
+        {"name": "Device Description", "patterns": ["device_description*"]},
+        {"name": "Manufacturing Information", "patterns": ["manufacturing*", "production*"]},
+        {"name": "Clinical Study Report", "patterns": ["clinical*", "csr*"]},
+        {"name": "Nonclinical Testing", "patterns": ["nonclinical*", "bench*", "preclinical*"]},
+        {"name": "Risk Analysis", "patterns": ["risk*", "fmea*"]},
+        {"name": "Labeling", "patterns": ["label*", "ifu*"]}
+    ]
+}
+
+# Compiled filename matchers per required document. Each pattern is tried as
+# written and upper-cased, like the former pair of case-sensitive globs; slot
+# order is the match priority.
+_DOC_MATCHERS = {
+    key: [
+        [
+            re.compile(fnmatch.translate(variant)).match
+            for pattern in doc["patterns"]
+            for variant in (pattern, pattern.upper())
+        ]
+        for doc in docs
+    ]
+    for key, docs in REQUIRED_DOCS.items()
+}
+
+
+@lru_cache(maxsize=256)
+def _parse_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD milestone date.
+
+    The fixed layout goes through fromisoformat; anything else (e.g. unpadded
+    months) falls back to strptime, which also supplies the ValueError for
+    malformed dates.
+    """
+    if len(value) == 10 and value[4] == "-" and value[7] == "-" and value[:4].isdigit():
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.strptime(value, "%Y-%m-%d")
+
 
 def find_submission_config(project_dir: Path) -> Optional[Dict]:
     """Find and load submission configuration file."""
+    base = str(project_dir)
     config_paths = [
-        project_dir / "fda_submission.json",
-        project_dir / "regulatory" / "fda_submission.json",
-        project_dir / ".fda" / "submission.json"
+        os.path.join(base, "fda_submission.json"),
+        os.path.join(base, "regulatory", "fda_submission.json"),
+        os.path.join(base, ".fda", "submission.json")
     ]
 
+    # Opening directly is the existence check; a miss costs one failed open
     for config_path in config_paths:
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                continue
+        try:
+            with open(config_path, "rb") as f:
+                raw = f.read()
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        try:
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError:
+            # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+            continue
 
     return None
 
@@ -138,18 +226,18 @@ def calculate_timeline_status(submission_type: str, milestones: Dict[str, str])
     # Check if submission has been sent
     if "submission_sent" in milestones:
         try:
-            submission_date = datetime.strptime(milestones["submission_sent"], "%Y-%m-%d")
+            submission_date = _parse_date(milestones["submission_sent"])
             today = datetime.now()
             result["days_elapsed"] = (today - submission_date).days
 
             # Check for AI hold
             ai_hold_days = 0
             if "ai_request" in milestones and "ai_response" in milestones:
-                ai_request_date = datetime.strptime(milestones["ai_request"], "%Y-%m-%d")
-                ai_response_date = datetime.strptime(milestones["ai_response"], "%Y-%m-%d")
+                ai_request_date = _parse_date(milestones["ai_request"])
+                ai_response_date = _parse_date(milestones["ai_response"])
                 ai_hold_days = (ai_response_date - ai_request_date).days
             elif "ai_request" in milestones and "ai_response" not in milestones:
-                ai_request_date = datetime.strptime(milestones["ai_request"], "%Y-%m-%d")
+                ai_request_date = _parse_date(milestones["ai_request"])
                 ai_hold_days = (today - ai_request_date).days
                 result["status"] = "ai_hold"
 
@@ -181,92 +269,105 @@ def calculate_timeline_status(submission_type: str, milestones: Dict[str, str])
 
 def analyze_milestone_status(submission_type: str, completed_milestones: Dict[str, str]) -> List[Dict]:
     """Analyze milestone completion status."""
-    milestone_list = MILESTONES.get(submission_type.split("_")[0], MILESTONES["510k"])
-
-    results = []
-    for milestone in milestone_list:
-        status = {
-            "id": milestone["id"],
-            "name": milestone["name"],
-            "phase": milestone["phase"],
-            "optional": milestone.get("optional", False),
-            "completed": milestone["id"] in completed_milestones,
-            "completion_date": completed_milestones.get(milestone["id"])
-        }
-        results.append(status)
-
-    return results
+    templates = _MILESTONE_TEMPLATES.get(submission_type.split("_")[0], _MILESTONE_TEMPLATES["510k"])
 
-
-def calculate_submission_readiness(project_dir: Path, submission_type: str) -> Dict:
-    """Check submission readiness by looking for required documentation."""
-
-    required_docs = {
-        "510k": [
-            {"name": "Device Description", "patterns": ["device_description*", "device_desc*"]},
-            {"name": "Indications for Use", "patterns": ["indications*", "ifu*"]},
-            {"name": "Substantial Equivalence", "patterns": ["substantial_equiv*", "se_comparison*", "predicate*"]},
-            {"name": "Performance Testing", "patterns": ["performance*", "test_report*", "bench_test*"]},
-            {"name": "Biocompatibility", "patterns": ["biocompat*", "iso_10993*"]},
-            {"name": "Labeling", "patterns": ["label*", "ifu*", "instructions*"]},
-            {"name": "Software Documentation", "patterns": ["software*", "iec_62304*"], "optional": True},
-            {"name": "Sterilization Validation", "patterns": ["steriliz*", "sterility*"], "optional": True}
-        ],
-        "de_novo": [
-            {"name": "Device Description", "patterns": ["device_description*", "device_desc*"]},
-            {"name": "Risk Assessment", "patterns": ["risk*", "hazard*"]},
-            {"name": "Special Controls", "patterns": ["special_control*"]},
-            {"name": "Performance Testing", "patterns": ["performance*", "test_report*"]},
-            {"name": "Labeling", "patterns": ["label*", "ifu*"]}
-        ],
-        "pma": [
-            {"name": "Device Description", "patterns": ["device_description*"]},
-            {"name": "Manufacturing Information", "patterns": ["manufacturing*", "production*"]},
-            {"name": "Clinical Study Report", "patterns": ["clinical*", "csr*"]},
-            {"name": "Nonclinical Testing", "patterns": ["nonclinical*", "bench*", "preclinical*"]},
-            {"name": "Risk Analysis", "patterns": ["risk*", "fmea*"]},
-            {"name": "Labeling", "patterns": ["label*", "ifu*"]}
-        ]
-    }
-
-    docs_to_check = required_docs.get(submission_type.split("_")[0], required_docs["510k"])
-
-    # Search common documentation directories
-    doc_dirs = [
-        project_dir / "regulatory",
-        project_dir / "regulatory" / "fda",
-        project_dir / "docs",
-        project_dir / "documentation",
-        project_dir / "dhf",
-        project_dir
+    return [
+        {
+            **template,
+            "completed": template["id"] in completed_milestones,
+            "completion_date": completed_milestones.get(template["id"])
+        }
+        for template in templates
     ]
 
-    results = []
-    for doc in docs_to_check:
-        found = False
-        found_path = None
 
-        for doc_dir in doc_dirs:
-            if not doc_dir.exists():
-                continue
+def _iter_tree(top: str):
+    """Yield the entries below ``top`` in the order ``Path.glob("**/*")`` visits them.
+
+    A directory's entries come before those of its subdirectories. Symlinked
+    directories are listed but not descended into, and unreadable directories
+    are skipped.
+    """
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return
+    yield from entries
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        if is_dir:
+            yield from _iter_tree(entry.path)
 
-            for pattern in doc["patterns"]:
-                matches = list(doc_dir.glob(f"**/{pattern}"))
-                matches.extend(list(doc_dir.glob(f"**/{pattern.upper()}")))
-                if matches:
-                    found = True
-                    found_path = str(matches[0].relative_to(project_dir))
-                    break
 
-            if found:
-                break
+def calculate_submission_readiness(project_dir: Path, submission_type: str) -> Dict:
+    """Check submission readiness by looking for required documentation."""
 
-        results.append({
+    doc_key = submission_type.split("_")[0]
+    if doc_key not in REQUIRED_DOCS:
+        doc_key = "510k"
+    docs_to_check = REQUIRED_DOCS[doc_key]
+    matchers = _DOC_MATCHERS[doc_key]
+
+    # Search common documentation directories, in priority order. One scandir
+    # of the project root shows which of them exist. regulatory/fda lies
+    # inside regulatory's walk, so it only needs its own walk when it is a
+    # symlink, because walks do not follow symlinked directories.
+    top_dirs = set()
+    try:
+        with os.scandir(project_dir) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        top_dirs.add(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    doc_dirs = []
+    for name in ("regulatory", "docs", "documentation", "dhf"):
+        if name in top_dirs:
+            doc_dirs.append(project_dir / name)
+            if name == "regulatory":
+                fda_dir = project_dir / "regulatory" / "fda"
+                if fda_dir.is_symlink() and fda_dir.is_dir():
+                    doc_dirs.append(fda_dir)
+    doc_dirs.append(project_dir)
+
+    # Walk each directory once, recording the first entry each slot matches
+    found_paths: List[Optional[str]] = [None] * len(docs_to_check)
+    for doc_dir in doc_dirs:
+        pending = [i for i, path in enumerate(found_paths) if path is None]
+        if not pending:
+            break
+
+        first_matches = {i: [None] * len(matchers[i]) for i in pending}
+        for entry in _iter_tree(str(doc_dir)):
+            name = entry.name
+            for i in pending:
+                slots = first_matches[i]
+                for k, match in enumerate(matchers[i]):
+                    if slots[k] is None and match(name):
+                        slots[k] = entry.path
+
+        for i in pending:
+            path = next((p for p in first_matches[i] if p is not None), None)
+            if path is not None:
+                found_paths[i] = os.path.relpath(path, project_dir)
+
+    results = [
+        {
             "name": doc["name"],
             "required": not doc.get("optional", False),
-            "found": found,
+            "found": found_path is not None,
             "path": found_path
-        })
+        }
+        for doc, found_path in zip(docs_to_check, found_paths)
+    ]
 
     required_found = sum(1 for r in results if r["required"] and r["found"])
     required_total = sum(1 for r in results if r["required"])
@@ -374,12 +475,11 @@ def generate_recommendations(result: Dict) -> List[str]:
         recommendations.append("Warning: Submission is behind FDA review schedule - consider contacting FDA")
 
     # Milestone recommendations
-    completed_phases = set()
+    completed_phases = 0
     for ms in result["milestones"]:
-        if ms["completed"]:
-            completed_phases.add(ms["phase"])
+        completed_phases |= _PHASE_BITS[ms["phase"]] * ms["completed"]
 
-    if "submission" not in completed_phases and "preparation" in completed_phases:
+    if not completed_phases & _PHASE_BITS["submission"] and completed_phases & _PHASE_BITS["preparation"]:
         recommendations.append("Ready for submission: Documentation complete, proceed with FDA submission")
 
     # Readiness recommendations
@@ -392,8 +492,17 @@ def generate_recommendations(result: Dict) -> List[str]:
     return recommendations
 
 
-def analyze_submission(project_dir: Path, submission_type: Optional[str] = None) -> Dict:
-    """Main analysis function."""
+def analyze_submission(
+    project_dir: Path,
+    submission_type: Optional[str] = None,
+    include_readiness: bool = True
+) -> Dict:
+    """Main analysis function.
+
+    The documentation readiness scan walks the project tree, so it is skipped
+    when ``include_readiness`` is False or the submission already has its
+    decision.
+    """
 
     # Try to find existing configuration
     config = find_submission_config(project_dir)
@@ -405,8 +514,7 @@ def analyze_submission(project_dir: Path, submission_type: Optional[str] = None)
             "submission_type": sub_type,
             "config_found": False,
             "timeline_status": calculate_timeline_status(sub_type, {}),
-            "milestones": analyze_milestone_status(sub_type, {}),
-            "readiness": calculate_submission_readiness(project_dir, sub_type)
+            "milestones": analyze_milestone_status(sub_type, {})
         }
     else:
         # Config found - full analysis
@@ -420,10 +528,12 @@ def analyze_submission(project_dir: Path, submission_type: Optional[str] = None)
             "predicate_device": config.get("predicate_device"),
             "config_found": True,
             "timeline_status": calculate_timeline_status(sub_type, milestones),
-            "milestones": analyze_milestone_status(sub_type, milestones),
-            "readiness": calculate_submission_readiness(project_dir, sub_type)
+            "milestones": analyze_milestone_status(sub_type, milestones)
         }
 
+    if include_readiness and result["timeline_status"]["status"] != "complete":
+        result["readiness"] = calculate_submission_readiness(project_dir, sub_type)
+
     # Generate recommendations
     result["recommendations"] = generate_recommendations(result)
 
@@ -451,6 +561,11 @@ def main():
         action="store_true",
         help="Output in JSON format"
     )
+    parser.add_argument(
+        "--no-readiness",
+        action="store_true",
+        help="Skip the documentation readiness scan of the project directory"
+    )
     parser.add_argument(
         "--init",
         action="store_true",
@@ -481,7 +596,7 @@ def main():
         print("Edit this file with your submission details and milestone dates.")
         return
 
-    result = analyze_submission(project_dir, args.type)
+    result = analyze_submission(project_dir, args.type, include_readiness=not args.no_readiness)
 
     if args.json:
         print(json.dumps(result, indent=2))
@@ -9,19 +9,43 @@ Usage:
     python hipaa_risk_assessment.py <project_dir>
     python hipaa_risk_assessment.py <project_dir> --category technical
     python hipaa_risk_assessment.py <project_dir> --json
+    python hipaa_risk_assessment.py <project_dir> --no-cache
 """
 
 import argparse
+import fnmatch
+import hashlib
 import json
 import os
+import pickle
 import re
 import sys
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
+try:
+    import hyperscan
+except ImportError:  # optional speed-up; patterns are searched with re otherwise
+    hyperscan = None
 
-# HIPAA Security Rule safeguards
+try:
+    import ahocorasick
+except ImportError:  # optional speed-up; literals are looked up one by one otherwise
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder is used otherwise
+    orjson = None
+
+
+# HIPAA Security Rule safeguards. Gaps in the code, PHI and vulnerability
+# patterns are bounded (".{0,64}" rather than ".*"), so a search never runs to
+# the end of a long line and backtracks from there.
 HIPAA_SAFEGUARDS = {
     "administrative": {
         "title": "Administrative Safeguards (§164.308)",
@@ -51,7 +75,7 @@ HIPAA_SAFEGUARDS = {
                 "title": "Information Access Management",
                 "requirement": "Access authorization, establishment, modification",
                 "doc_patterns": ["access_management*", "role_definition*", "access_control*"],
-                "code_patterns": [r"role.*based", r"permission", r"authorization"],
+                "code_patterns": [r"role.{0,64}based", r"permission", r"authorization"],
                 "weight": 8
             },
             "security_training": {
@@ -65,7 +89,7 @@ HIPAA_SAFEGUARDS = {
                 "title": "Security Incident Procedures",
                 "requirement": "Incident response and reporting",
                 "doc_patterns": ["incident*", "breach*", "security_event*"],
-                "code_patterns": [r"incident.*report", r"security.*alert", r"breach.*notify"],
+                "code_patterns": [r"incident.{0,64}report", r"security.{0,64}alert", r"breach.{0,64}notify"],
                 "weight": 8
             },
             "contingency_plan": {
@@ -112,7 +136,7 @@ HIPAA_SAFEGUARDS = {
                 "title": "Device and Media Controls",
                 "requirement": "Disposal, media re-use, accountability",
                 "doc_patterns": ["media_disposal*", "device_disposal*", "data_sanitization*"],
-                "code_patterns": [r"secure.*delete", r"wipe", r"sanitize"],
+                "code_patterns": [r"secure.{0,64}delete", r"wipe", r"sanitize"],
                 "weight": 5
             }
         }
@@ -127,10 +151,10 @@ HIPAA_SAFEGUARDS = {
                 "code_patterns": [
                     r"authentication",
                     r"authorize",
-                    r"session.*timeout",
-                    r"auto.*logout",
-                    r"unique.*id",
-                    r"user.*id"
+                    r"session.{0,64}timeout",
+                    r"auto.{0,64}logout",
+                    r"unique.{0,64}id",
+                    r"user.{0,64}id"
                 ],
                 "weight": 10
             },
@@ -139,10 +163,10 @@ HIPAA_SAFEGUARDS = {
                 "requirement": "Record and examine activity in systems with ePHI",
                 "doc_patterns": ["audit_log*", "access_log*", "security_log*"],
                 "code_patterns": [
-                    r"audit.*log",
-                    r"access.*log",
-                    r"log.*access",
-                    r"security.*event",
+                    r"audit.{0,64}log",
+                    r"access.{0,64}log",
+                    r"log.{0,64}access",
+                    r"security.{0,64}event",
                     r"logger"
                 ],
                 "weight": 10
@@ -155,8 +179,8 @@ HIPAA_SAFEGUARDS = {
                     r"checksum",
                     r"hash",
                     r"hmac",
-                    r"integrity.*check",
-                    r"digital.*signature"
+                    r"integrity.{0,64}check",
+                    r"digital.{0,64}signature"
                 ],
                 "weight": 8
             },
@@ -167,9 +191,9 @@ HIPAA_SAFEGUARDS = {
                 "code_patterns": [
                     r"authenticate",
                     r"mfa",
-                    r"two.*factor",
+                    r"two.{0,64}factor",
                     r"2fa",
-                    r"multi.*factor",
+                    r"multi.{0,64}factor",
                     r"oauth",
                     r"jwt"
                 ],
@@ -183,8 +207,8 @@ HIPAA_SAFEGUARDS = {
                     r"https",
                     r"tls",
                     r"ssl",
-                    r"encrypt.*transit",
-                    r"secure.*connection"
+                    r"encrypt.{0,64}transit",
+                    r"secure.{0,64}connection"
                 ],
                 "weight": 10
             }
@@ -194,173 +218,571 @@ HIPAA_SAFEGUARDS = {
 
 # PHI data patterns to detect in code
 PHI_PATTERNS = [
-    (r"patient.*name", "Patient Name"),
-    (r"ssn|social.*security", "Social Security Number"),
-    (r"date.*of.*birth|dob", "Date of Birth"),
-    (r"medical.*record", "Medical Record Number"),
-    (r"health.*plan", "Health Plan ID"),
-    (r"diagnosis|icd.*code", "Diagnosis/ICD Code"),
+    (r"patient.{0,64}name", "Patient Name"),
+    (r"ssn|social.{0,64}security", "Social Security Number"),
+    (r"date.{0,64}of.{0,64}birth|dob", "Date of Birth"),
+    (r"medical.{0,64}record", "Medical Record Number"),
+    (r"health.{0,64}plan", "Health Plan ID"),
+    (r"diagnosis|icd.{0,64}code", "Diagnosis/ICD Code"),
     (r"prescription|medication", "Medication/Prescription"),
     (r"insurance", "Insurance Information"),
-    (r"phone.*number|telephone", "Phone Number"),
-    (r"email.*address", "Email Address"),
+    (r"phone.{0,64}number|telephone", "Phone Number"),
+    (r"email.{0,64}address", "Email Address"),
     (r"address|street|city|zip", "Physical Address"),
     (r"biometric", "Biometric Data")
 ]
 
 # Security vulnerability patterns (dynamic code execution, hardcoded secrets)
 VULNERABILITY_PATTERNS = [
-    (r"password.*=.*['\"]", "Hardcoded password"),
-    (r"api.*key.*=.*['\"]", "Hardcoded API key"),
-    (r"secret.*=.*['\"]", "Hardcoded secret"),
+    (r"password.{0,64}=.{0,64}['\"]", "Hardcoded password"),
+    (r"api.{0,64}key.{0,64}=.{0,64}['\"]", "Hardcoded API key"),
+    (r"secret.{0,64}=.{0,64}['\"]", "Hardcoded secret"),
     (r"http://(?!localhost)", "Unencrypted HTTP connection"),
-    (r"verify.*=.*False", "SSL verification disabled"),
-    (r"dynamic.*code.*execution", "Dynamic code execution risk"),
-    (r"disable.*ssl", "SSL disabled"),
+    (r"verify.{0,64}=.{0,64}False", "SSL verification disabled"),
+    (r"dynamic.{0,64}code.{0,64}execution", "Dynamic code execution risk"),
+    (r"disable.{0,64}ssl", "SSL disabled"),
     (r"insecure", "Insecure configuration")
 ]
 
 
-def scan_documentation(project_dir: Path, patterns: List[str]) -> List[str]:
-    """Scan for documentation matching patterns."""
-    found = []
-    doc_dirs = [
-        project_dir / "docs",
-        project_dir / "documentation",
-        project_dir / "policies",
-        project_dir / "compliance",
-        project_dir / "hipaa",
-        project_dir
+def _required_literals(pattern: str) -> Optional[Tuple[bytes, ...]]:
+    """Return lowercase byte strings one of which every match of ``pattern`` contains.
+
+    Each top-level alternative contributes its longest run of literal
+    characters outside groups and character classes. Returns None when an
+    alternative has no such run, so the pattern cannot be pre-filtered.
+    """
+    literals = []
+    run = best = ""
+    depth = 0
+    i = 0
+    while i <= len(pattern):
+        ch = pattern[i] if i < len(pattern) else "|"
+        i += 1
+        if depth:
+            if ch == "\\":
+                i += 1
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            continue
+        if ch.isalnum() or ch in " _-=:/'\"<>,;!@#%&~`":
+            run += ch
+            continue
+        if ch in "*?{":
+            run = run[:-1]  # The quantified character is optional
+        if len(run) > len(best):
+            best = run
+        run = ""
+        if ch == "\\":
+            i += 1
+        elif ch == "{":
+            i = pattern.find("}", i) + 1 or len(pattern)
+        elif ch == "[":
+            i += pattern[i:i + 1] == "]"
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif ch == "(":
+            depth = 1
+        elif ch == "|":
+            if not best:
+                return None
+            literals.append(best.lower().encode())
+            best = ""
+    return tuple(literals)
+
+
+def _compile_lowercase(pattern: str) -> "re.Pattern":
+    """Compile ``pattern`` for searching lowercased content.
+
+    The pattern is lowercased and compiled without re.IGNORECASE, which gives
+    the same ASCII case-insensitive matches while the engine skips case
+    folding. Patterns with an escape that lowercasing would change, such as
+    \\S or \\W, keep the flag instead.
+    """
+    if re.search(r"\\[A-Z]", pattern):
+        return re.compile(pattern.encode(), re.IGNORECASE)
+    return re.compile(pattern.lower().encode())
+
+
+# The code, PHI and vulnerability patterns compiled once at import, each with
+# the literals a file must contain before the pattern is searched for. They
+# are bytes patterns searched in the lowercased file content, so files are
+# scanned without decoding them.
+_CODE_PATTERN_RES = {
+    control_id: [
+        (_required_literals(pattern), _compile_lowercase(pattern))
+        for pattern in control_data["code_patterns"]
     ]
+    for category_data in HIPAA_SAFEGUARDS.values()
+    for control_id, control_data in category_data["controls"].items()
+    if control_data["code_patterns"]
+}
+_PHI_RES = [
+    (_required_literals(pattern), _compile_lowercase(pattern), phi_type)
+    for pattern, phi_type in PHI_PATTERNS
+]
+_VULNERABILITY_RES = [
+    (_required_literals(pattern), _compile_lowercase(pattern), vuln_type)
+    for pattern, vuln_type in VULNERABILITY_PATTERNS
+]
 
-    for doc_dir in doc_dirs:
-        if not doc_dir.exists():
-            continue
+# Vulnerability types that expose a credential and raise the risk level
+_CRITICAL_VULNERABILITIES = frozenset(
+    vuln_type for _, vuln_type in VULNERABILITY_PATTERNS
+    if "password" in vuln_type.lower() or "secret" in vuln_type.lower()
+)
 
-        for pattern in patterns:
-            for ext in ["*.md", "*.pdf", "*.docx", "*.doc", "*.txt"]:
-                try:
-                    for match in doc_dir.glob(f"**/{pattern}{ext}"):
-                        rel_path = str(match.relative_to(project_dir))
-                        if rel_path not in found:
-                            found.append(rel_path)
-                except Exception:
-                    continue
-
-    return found
-
-
-def scan_code_patterns(project_dir: Path, patterns: List[str]) -> List[Dict]:
-    """Scan source code for patterns."""
-    matches = []
-    code_extensions = ["*.py", "*.js", "*.ts", "*.java", "*.cs", "*.go", "*.rb"]
-
-    src_dirs = [
-        project_dir / "src",
-        project_dir / "app",
-        project_dir / "lib",
-        project_dir
-    ]
 
-    for src_dir in src_dirs:
-        if not src_dir.exists():
-            continue
+# Lookarounds and backreferences, which Hyperscan does not support
+_HS_UNSUPPORTED = re.compile(rb"\(\?<?[=!]|\\[1-9]")
+
+
+def _compile_hyperscan(patterns: List["re.Pattern"]) -> Tuple[Any, Dict["re.Pattern", int]]:
+    """Compile the patterns Hyperscan supports into one block-mode database.
 
-        for ext in code_extensions:
+    Returns the database, or None if no pattern is supported, and the id of
+    each compiled pattern. Hyperscan rejects some constructs, such as
+    lookaheads; those patterns are left to ``re``. Known unsupported
+    constructs are screened out up front so the database normally compiles
+    in one go; only if that still fails is each pattern tried on its own.
+    """
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    supported = [
+        pattern for pattern in dict.fromkeys(patterns)
+        if not _HS_UNSUPPORTED.search(pattern.pattern)
+    ]
+
+    def build(candidates):
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=[pattern.pattern for pattern in candidates],
+            ids=list(range(len(candidates))),
+            flags=[flags] * len(candidates),
+        )
+        return database
+
+    try:
+        database = build(supported) if supported else None
+    except hyperscan.error:
+        checked = []
+        for pattern in supported:
             try:
-                for file_path in src_dir.glob(f"**/{ext}"):
-                    # Skip node_modules, venv, etc.
-                    if any(skip in str(file_path) for skip in ["node_modules", "venv", ".venv", "__pycache__", ".git"]):
-                        continue
-
-                    try:
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        for pattern in patterns:
-                            if re.search(pattern, content, re.IGNORECASE):
-                                rel_path = str(file_path.relative_to(project_dir))
-                                matches.append({
-                                    "file": rel_path,
-                                    "pattern": pattern
-                                })
-                                break  # One match per file per control is enough
-                    except Exception:
-                        continue
-            except Exception:
+                hyperscan.Database().compile(expressions=[pattern.pattern], flags=[flags])
+            except hyperscan.error:
                 continue
+            checked.append(pattern)
+        supported = checked
+        database = build(supported) if supported else None
+    if database is None:
+        return None, {}
+    return database, {pattern: hs_id for hs_id, pattern in enumerate(supported)}
+
+
+# With Hyperscan installed, one scan of a file tells which patterns occur in it
+if hyperscan is not None:
+    _HS_DATABASE, _HS_IDS = _compile_hyperscan(
+        [pattern for patterns in _CODE_PATTERN_RES.values() for _, pattern in patterns]
+        + [pattern for _, pattern, _ in _PHI_RES]
+        + [pattern for _, pattern, _ in _VULNERABILITY_RES]
+    )
+else:
+    _HS_DATABASE, _HS_IDS = None, {}
+
+# Without Hyperscan, one Aho-Corasick pass over a file tells which of the
+# prefilter literals it contains. The automaton is keyed by str, so the
+# lowercased bytes are searched as Latin-1 text, which maps byte for byte.
+if _HS_DATABASE is None and ahocorasick is not None:
+    _LITERAL_AUTOMATON = ahocorasick.Automaton()
+    for _literal in {
+        literal
+        for literals, *_ in [check for checks in _CODE_PATTERN_RES.values() for check in checks]
+        + _PHI_RES + _VULNERABILITY_RES
+        for literal in literals or ()
+    }:
+        _LITERAL_AUTOMATON.add_word(_literal.decode("latin-1"), _literal)
+    _LITERAL_AUTOMATON.make_automaton()
+else:
+    _LITERAL_AUTOMATON = None
+
+# Source and config file extensions read by the code scans. Control evidence
+# comes from source files, PHI from source files other than Ruby, and
+# vulnerabilities also from config files. Files are scanned extension by
+# extension in this order.
+SCAN_EXTENSIONS = (".py", ".js", ".ts", ".java", ".cs", ".go", ".rb", ".yaml", ".yml", ".json")
+CODE_EXTENSIONS = (".py", ".js", ".ts", ".java", ".cs", ".go", ".rb")
+PHI_EXTENSIONS = (".py", ".js", ".ts", ".java", ".cs", ".go")
+VULNERABILITY_EXTENSIONS = (".py", ".js", ".ts", ".java", ".cs", ".go", ".yaml", ".yml", ".json")
+
+# Source files larger than this, or with a NUL byte in their first
+# BINARY_SNIFF_BYTES, are skipped as generated or binary
+MAX_SCAN_BYTES = 16 * 1024 * 1024
+BINARY_SNIFF_BYTES = 4096
+
+# Files larger than this are scanned in blocks of about SCAN_BLOCK_BYTES
+# instead of being read whole. Blocks end on a line break; no pattern matches
+# across one, so every match lies within a single block.
+CHUNKED_SCAN_BYTES = 4 * 1024 * 1024
+SCAN_BLOCK_BYTES = 1024 * 1024
+
+# Projects with at least this many source files are scanned in parallel
+PARALLEL_MIN_FILES = 256
+
+# Dependency, cache and build output directories the scans do not descend into
+SKIP_DIRS = frozenset({"node_modules", "venv", ".venv", "__pycache__", ".git", "dist", "build"})
+
+# Documentation directories searched besides the project root, and the
+# document types matched against each control's doc_patterns
+DOC_DIRS = ("docs", "documentation", "policies", "compliance", "hipaa")
+DOC_EXTENSIONS = (".md", ".pdf", ".docx", ".doc", ".txt")
+
+# Slot-backed records where dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class PHIFinding:
+    file: str
+    phi_type: str
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class Vulnerability:
+    file: str
+    vulnerability: str
+    count: int
+
+
+def _walk_entries(top: str, prefix_len: int) -> Tuple[Tuple[str, str], ...]:
+    """List (relative path, path) for every file below ``top``.
+
+    Directories in SKIP_DIRS are pruned before descending, and symlinked
+    directories are not followed. Paths are built by string concatenation
+    and relative paths by slicing off the first ``prefix_len`` characters.
+    """
+    entries = []
+    for root, dirs, files in os.walk(top):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        root = os.path.join(root, "")
+        for name in files:
+            path = root + name
+            entries.append((path[prefix_len:], path))
+    return tuple(entries)
+
+
+@lru_cache(maxsize=None)
+def _project_tree(project_dir: str) -> Tuple[Tuple[str, str], ...]:
+    """List (relative path, path) for every file in the project, walking it once per run."""
+    return _walk_entries(project_dir, len(os.path.join(project_dir, "")))
+
+
+@lru_cache(maxsize=8)
+def _inventory(project_dir: str, exts: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """List (relative path, path) for the project files with one of ``exts``."""
+    return tuple(item for item in _project_tree(project_dir) if item[0].endswith(exts))
+
+
+@lru_cache(maxsize=None)
+def _doc_index(project_dir: Path) -> Tuple[Tuple[str, str], ...]:
+    """List (relative path, name) for every document the documentation scan can match.
+
+    The documentation directories lie inside the project, so the project
+    inventory covers them, except symlinked ones, which the project walk does
+    not descend into.
+    """
+    root = str(project_dir)
+    prefix_len = len(os.path.join(root, ""))
+    entries = list(_inventory(root, DOC_EXTENSIONS))
+    for name in DOC_DIRS:
+        path = os.path.join(root, name)
+        if os.path.islink(path):
+            entries.extend(item for item in _walk_entries(path, prefix_len) if item[0].endswith(DOC_EXTENSIONS))
+
+    return tuple((rel_path, rel_path.rpartition(os.sep)[2]) for rel_path, _ in entries)
+
+
+def scan_documentation(project_dir: Path, control_patterns: Dict[str, List[str]],
+                       max_evidence: Optional[int] = None) -> Dict[str, List[str]]:
+    """Find the documentation matching each control's doc patterns.
+
+    Several controls share patterns, such as "access_control*". Each distinct
+    pattern is matched against the document names once and its matches are
+    credited to every control listing it. With ``max_evidence``, a pattern
+    stops at that many documents and is skipped once all its controls have
+    that many.
+    """
+    pattern_controls: Dict[str, List[str]] = {}
+    for control_id, patterns in control_patterns.items():
+        for pattern in patterns:
+            pattern_controls.setdefault(pattern, []).append(control_id)
 
-    return matches
+    index = _doc_index(project_dir)
+    found: Dict[str, set] = {control_id: set() for control_id in control_patterns}
+    for pattern, control_ids in pattern_controls.items():
+        if max_evidence is not None and all(len(found[c]) >= max_evidence for c in control_ids):
+            continue
+        matcher = re.compile("|".join(fnmatch.translate(f"{pattern}*{ext}") for ext in DOC_EXTENSIONS))
+        matches = (rel_path for rel_path, name in index if matcher.match(name))
+        if max_evidence is not None:
+            matches = list(islice(matches, max_evidence))
+        else:
+            matches = list(matches)
+        for control_id in control_ids:
+            found[control_id].update(matches)
+
+    return {control_id: sorted(paths) for control_id, paths in found.items()}
+
+
+def collect_code_files(project_dir: Path) -> List[Tuple[str, str]]:
+    """List the source and config files to scan as (relative path, path) pairs.
+
+    Files are grouped by extension in SCAN_EXTENSIONS order, each group in
+    walk order.
+    """
+    groups: Dict[str, List[Tuple[str, str]]] = {ext: [] for ext in SCAN_EXTENSIONS}
+    for rel_path, path in _inventory(str(project_dir), SCAN_EXTENSIONS):
+        groups[rel_path[rel_path.rfind("."):]].append((rel_path, path))
+
+    return [item for ext in SCAN_EXTENSIONS for item in groups[ext]]
+
+
+def _record_hit(hs_id: int, start: int, end: int, flags: int, hits: set) -> None:
+    """Hyperscan match handler collecting the ids of the patterns found."""
+    hits.add(hs_id)
+
+
+@lru_cache(maxsize=None)
+def _code_checks(control_ids: Tuple[str, ...]) -> Tuple[Tuple[Any, "re.Pattern", frozenset], ...]:
+    """Pair each distinct code pattern of ``control_ids`` with the controls it evidences."""
+    owners: Dict["re.Pattern", Tuple[Any, set]] = {}
+    for control_id in control_ids:
+        for literals, pattern in _CODE_PATTERN_RES[control_id]:
+            owners.setdefault(pattern, (literals, set()))[1].add(control_id)
+    return tuple((literals, pattern, frozenset(ids)) for pattern, (literals, ids) in owners.items())
+
+
+def _matches(literals: Optional[Tuple[bytes, ...]], pattern: "re.Pattern", lowered: bytes,
+             hits: Optional[set], present: Optional[set]) -> bool:
+    """Tell whether ``pattern`` occurs in the lowercased content, trying the cheap checks first.
+
+    ``hits`` holds the Hyperscan ids found in the content and ``present`` the
+    prefilter literals it contains, each None when not computed.
+    """
+    if hits is not None:
+        hs_id = _HS_IDS.get(pattern)
+        if hs_id is not None:
+            return hs_id in hits
+    if literals is not None:
+        if present is not None:
+            if present.isdisjoint(literals):
+                return False
+        elif not any(lit in lowered for lit in literals):
+            return False
+    return pattern.search(lowered) is not None
+
+
+def _iter_blocks(f, data: bytes):
+    """Yield ``data`` and the rest of the binary file ``f`` in blocks of whole lines."""
+    while data:
+        if not data.endswith(b"\n"):
+            data += f.readline()
+        yield data
+        data = f.read(SCAN_BLOCK_BYTES)
+
+
+def _scan_file(file: Tuple[str, str], control_ids: Tuple[str, ...]) -> Optional[Tuple]:
+    """Scan one source file for control evidence, PHI and vulnerabilities.
+
+    Returns the ids of the controls it evidences, the PHI types it handles in
+    PHI_PATTERNS order, and a list of (vulnerability, count) pairs; None if
+    the file cannot be read or is too large or binary to scan.
+    """
+    rel_path, path = file
+    code_checks = _code_checks(control_ids) if rel_path.endswith(CODE_EXTENSIONS) else ()
+    check_phi = rel_path.endswith(PHI_EXTENSIONS)
+    check_vulnerabilities = rel_path.endswith(VULNERABILITY_EXTENSIONS)
+
+    controls = set()
+    phi_found = [False] * len(_PHI_RES)
+    vuln_counts = [0] * len(_VULNERABILITY_RES)
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_SCAN_BYTES:
+                return None
+            head = f.read(BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                return None
+            if size > CHUNKED_SCAN_BYTES:
+                blocks = _iter_blocks(f, head + f.read(SCAN_BLOCK_BYTES - len(head)))
+            else:
+                blocks = (head + f.read(),)
+
+            for content in blocks:
+                lowered = content.lower()
+                hits = present = None
+                if _HS_DATABASE is not None:
+                    hits = set()
+                    _HS_DATABASE.scan(content, match_event_handler=_record_hit, context=hits)
+                elif _LITERAL_AUTOMATON is not None:
+                    present = {literal for _, literal in _LITERAL_AUTOMATON.iter(lowered.decode("latin-1"))}
+
+                for literals, pattern, owners in code_checks:
+                    if owners <= controls:
+                        continue  # One match per file per control is enough
+                    if _matches(literals, pattern, lowered, hits, present):
+                        controls |= owners
+
+                if check_phi:
+                    for index, (literals, pattern, _) in enumerate(_PHI_RES):
+                        if not phi_found[index] and _matches(literals, pattern, lowered, hits, present):
+                            phi_found[index] = True
+
+                if check_vulnerabilities:
+                    for index, (literals, pattern, _) in enumerate(_VULNERABILITY_RES):
+                        if _matches(literals, pattern, lowered, hits, present):
+                            vuln_counts[index] += len(pattern.findall(lowered))
+    except Exception:
+        return None
+
+    phi_types = [phi_type for (_, _, phi_type), found in zip(_PHI_RES, phi_found) if found]
+    vulnerabilities = [
+        (vuln_type, count) for (_, _, vuln_type), count in zip(_VULNERABILITY_RES, vuln_counts) if count
+    ]
+    return controls, phi_types, vulnerabilities
+
+
+def scan_code_files(files: List[Tuple[str, str]], control_ids: List[str],
+                    max_evidence: Optional[int] = None) -> Dict:
+    """Scan source files for control evidence, PHI and vulnerabilities.
+
+    Each file is read once and checked against every pattern group that
+    applies to its extension. Code evidence is collected for ``control_ids``,
+    up to ``max_evidence`` files per control if given; scanned serially, later
+    files are not checked for controls that already have enough. Files are
+    independent, so large projects are scanned in parallel processes; results
+    keep the file order.
+    """
+    code_evidence: Dict[str, List[str]] = {control_id: [] for control_id in control_ids}
+
+    def scan_serially():
+        pending = tuple(control_ids)
+        for file in files:
+            if max_evidence is not None:
+                pending = tuple(c for c in pending if len(code_evidence[c]) < max_evidence)
+            yield _scan_file(file, pending)
+
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(files) < PARALLEL_MIN_FILES:
+        results = scan_serially()  # Consumed file by file by the merge below
+    else:
+        scan = partial(_scan_file, control_ids=tuple(control_ids))
+        # Imported here: concurrent.futures pulls in multiprocessing and logging,
+        # which would dominate start-up for the common serial case
+        from concurrent.futures import ProcessPoolExecutor
 
+        chunksize = max(1, len(files) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(scan, files, chunksize=chunksize))
 
-def detect_phi_handling(project_dir: Path) -> Dict:
-    """Detect potential PHI handling in code."""
     phi_found = []
-    code_extensions = ["*.py", "*.js", "*.ts", "*.java", "*.cs", "*.go"]
-
-    for ext in code_extensions:
-        try:
-            for file_path in project_dir.glob(f"**/{ext}"):
-                if any(skip in str(file_path) for skip in ["node_modules", "venv", ".venv", "__pycache__", ".git"]):
-                    continue
-
-                try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    rel_path = str(file_path.relative_to(project_dir))
-
-                    for pattern, phi_type in PHI_PATTERNS:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            phi_found.append({
-                                "file": rel_path,
-                                "phi_type": phi_type
-                            })
-                            break
-                except Exception:
-                    continue
-        except Exception:
+    vulnerabilities = []
+    for (rel_path, _), result in zip(files, results):
+        if result is None:
             continue
+        controls, phi_types, file_vulnerabilities = result
+        for control_id in controls:
+            if max_evidence is None or len(code_evidence[control_id]) < max_evidence:
+                code_evidence[control_id].append(rel_path)
+        for phi_type in phi_types:
+            phi_found.append(PHIFinding(rel_path, phi_type))
+        for vuln_type, count in file_vulnerabilities:
+            vulnerabilities.append(Vulnerability(rel_path, vuln_type, count))
 
     return {
-        "phi_detected": len(phi_found) > 0,
-        "files_with_phi": phi_found,
-        "phi_types": list(set(p["phi_type"] for p in phi_found))
+        "code_evidence": code_evidence,
+        "phi_detection": {
+            "phi_detected": len(phi_found) > 0,
+            "files_with_phi": phi_found,
+            "phi_types": list(dict.fromkeys(p.phi_type for p in phi_found))
+        },
+        "vulnerabilities": vulnerabilities
     }
 
 
-def detect_security_vulnerabilities(project_dir: Path) -> List[Dict]:
-    """Scan for security vulnerabilities."""
-    vulnerabilities = []
-    code_extensions = ["*.py", "*.js", "*.ts", "*.java", "*.cs", "*.go", "*.yaml", "*.yml", "*.json"]
+def _cache_dir() -> str:
+    """Directory for scan caches, following the XDG convention."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "hipaa_risk")
 
-    for ext in code_extensions:
-        try:
-            for file_path in project_dir.glob(f"**/{ext}"):
-                if any(skip in str(file_path) for skip in ["node_modules", "venv", ".venv", "__pycache__", ".git"]):
-                    continue
-
-                try:
-                    content = file_path.read_text(encoding='utf-8', errors='ignore')
-                    rel_path = str(file_path.relative_to(project_dir))
-
-                    for pattern, vuln_type in VULNERABILITY_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            vulnerabilities.append({
-                                "file": rel_path,
-                                "vulnerability": vuln_type,
-                                "count": len(matches)
-                            })
-                except Exception:
-                    continue
-        except Exception:
-            continue
 
-    return vulnerabilities
+def _scan_fingerprint(paths: List[str], scan_key: str) -> str:
+    """Hash ``scan_key`` with the path, mtime and size of each of ``paths`` and of this script.
 
+    Adding, removing or editing a file the scans read changes the
+    fingerprint, and so does editing the patterns in this script.
+    """
+    digest = hashlib.blake2b(scan_key.encode(), digest_size=16)
+    for path in [__file__, *paths]:
+        try:
+            st = os.stat(path)
+            digest.update(b"%s:%d:%d\n" % (os.fsencode(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            digest.update(b"%s:-\n" % os.fsencode(path))
+    return digest.hexdigest()
+
+
+def scan_project(project_dir: Path, controls: Dict[str, Dict], max_evidence: Optional[int] = None,
+                 use_cache: bool = False) -> Tuple[Dict[str, List[str]], Dict]:
+    """Scan the documentation and source files once for all ``controls``.
+
+    Returns the documentation evidence per control and the code scan. With
+    ``use_cache``, the results are kept in ~/.cache/hipaa_risk under a
+    fingerprint of every file the scans read, and reused while none of those
+    files changes. Cache read/write failures fall back to scanning.
+    """
+    files = collect_code_files(project_dir)
+    cache_path = None
+    if use_cache:
+        root = str(project_dir)
+        scan_key = repr((root, list(controls), max_evidence))
+        paths = [path for _, path in files] + [os.path.join(root, rel_path) for rel_path, _ in _doc_index(project_dir)]
+        cache_path = os.path.join(_cache_dir(), f"{_scan_fingerprint(paths, scan_key)}.pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass  # Missing, corrupt, or written by this script under another module name
+
+    doc_evidence = scan_documentation(
+        project_dir, {control_id: control_data["doc_patterns"] for control_id, control_data in controls.items()},
+        max_evidence
+    )
+    code_scan = scan_code_files(
+        files,
+        [control_id for control_id, control_data in controls.items() if control_data["code_patterns"]],
+        max_evidence
+    )
+
+    if cache_path is not None:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump((doc_evidence, code_scan), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return doc_evidence, code_scan
 
-def assess_control(project_dir: Path, control_id: str, control_data: Dict) -> Dict:
-    """Assess a single HIPAA control."""
-    doc_evidence = scan_documentation(project_dir, control_data["doc_patterns"])
-    code_evidence = scan_code_patterns(project_dir, control_data["code_patterns"]) if control_data["code_patterns"] else []
 
+def assess_control(control_id: str, control_data: Dict, doc_evidence: List[str], code_evidence: List[str]) -> Dict:
+    """Assess a single HIPAA control against the documentation and code evidence found for it."""
     # Determine compliance status
     has_docs = len(doc_evidence) > 0
     has_code = len(code_evidence) > 0
@@ -384,18 +806,21 @@ def assess_control(project_dir: Path, control_id: str, control_data: Dict) -> Di
         "weight": control_data["weight"],
         "weighted_score": (score * control_data["weight"]) / 100,
         "documentation": doc_evidence,
-        "code_evidence": [e["file"] for e in code_evidence]
+        "code_evidence": code_evidence
     }
 
 
-def assess_category(project_dir: Path, category_id: str, category_data: Dict) -> Dict:
-    """Assess a HIPAA safeguard category."""
+def assess_category(category_id: str, category_data: Dict, doc_evidence: Dict[str, List[str]],
+                    code_evidence: Dict[str, List[str]]) -> Dict:
+    """Assess a HIPAA safeguard category from the evidence found per control."""
     control_results = []
     total_weight = 0
     weighted_score = 0
 
     for control_id, control_data in category_data["controls"].items():
-        result = assess_control(project_dir, control_id, control_data)
+        result = assess_control(
+            control_id, control_data, doc_evidence[control_id], code_evidence.get(control_id, [])
+        )
         control_results.append(result)
         total_weight += control_data["weight"]
         weighted_score += result["weighted_score"]
@@ -413,7 +838,7 @@ def assess_category(project_dir: Path, category_id: str, category_data: Dict) ->
     }
 
 
-def calculate_risk_level(overall_score: float, vulnerabilities: List[Dict], phi_data: Dict) -> Dict:
+def calculate_risk_level(overall_score: float, vulnerabilities: List[Vulnerability], phi_data: Dict) -> Dict:
     """Calculate overall HIPAA risk level."""
     # Base risk from compliance score
     if overall_score >= 80:
@@ -430,7 +855,7 @@ def calculate_risk_level(overall_score: float, vulnerabilities: List[Dict], phi_
         base_score = 4
 
     # Adjust for vulnerabilities
-    critical_vulns = sum(1 for v in vulnerabilities if "password" in v["vulnerability"].lower() or "secret" in v["vulnerability"].lower())
+    critical_vulns = sum(1 for v in vulnerabilities if v.vulnerability in _CRITICAL_VULNERABILITIES)
     if critical_vulns > 0:
         base_score = min(4, base_score + 1)
 
@@ -472,11 +897,32 @@ def generate_recommendations(assessment: Dict) -> List[str]:
 
     # Vulnerabilities
     for vuln in assessment.get("vulnerabilities", [])[:5]:
-        recommendations.append(f"SECURITY: Fix {vuln['vulnerability']} in {vuln['file']}")
+        recommendations.append(f"SECURITY: Fix {vuln.vulnerability} in {vuln.file}")
 
     return recommendations[:10]  # Top 10
 
 
+def print_json_report(result: Dict) -> None:
+    """Print the report as indented JSON.
+
+    With orjson installed the encoded bytes go straight to stdout; non-ASCII
+    text is then written as UTF-8 rather than escaped. Reports orjson
+    cannot encode, such as paths with undecodable bytes, use the stdlib.
+    """
+    stream = getattr(sys.stdout, "buffer", None)
+    if orjson is not None and stream is not None:
+        try:
+            encoded = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            sys.stdout.flush()
+            stream.write(encoded)
+            stream.flush()
+            return
+    print(json.dumps(result, indent=2, default=asdict))
+
+
 def print_text_report(result: Dict) -> None:
     """Print human-readable report."""
     print("=" * 70)
@@ -513,13 +959,13 @@ def print_text_report(result: Dict) -> None:
     if result["phi_detection"]["phi_detected"]:
         print("\n--- PHI HANDLING DETECTED ---")
         print(f"  PHI Types: {', '.join(result['phi_detection']['phi_types'])}")
-        print(f"  Files: {len(result['phi_detection']['files_with_phi'])}")
+        print(f"  Files: {len(set(p.file for p in result['phi_detection']['files_with_phi']))}")
 
     # Vulnerabilities
     if result["vulnerabilities"]:
         print("\n--- SECURITY VULNERABILITIES ---")
         for vuln in result["vulnerabilities"][:10]:
-            print(f"  - {vuln['vulnerability']}: {vuln['file']}")
+            print(f"  - {vuln.vulnerability}: {vuln.file}")
 
     # Recommendations
     if result["recommendations"]:
@@ -557,6 +1003,11 @@ def main():
         action="store_true",
         help="Include detailed evidence in output"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Scan the project even if ~/.cache/hipaa_risk has results for its unchanged files"
+    )
 
     args = parser.parse_args()
     project_dir = Path(args.project_dir).resolve()
@@ -570,13 +1021,24 @@ def main():
     if args.category:
         categories_to_assess = {args.category: HIPAA_SAFEGUARDS[args.category]}
 
+    # Scan the documentation and source files once for all controls. A control's
+    # status only depends on whether it has evidence, so unless the evidence is
+    # reported, the scans stop at the first match per control.
+    max_evidence = None if args.detailed else 1
+    controls = {
+        control_id: control_data
+        for cat_data in categories_to_assess.values()
+        for control_id, control_data in cat_data["controls"].items()
+    }
+    doc_evidence, code_scan = scan_project(project_dir, controls, max_evidence, use_cache=not args.no_cache)
+
     # Perform assessment
     category_results = []
     total_weight = 0
     weighted_score = 0
 
     for cat_id, cat_data in categories_to_assess.items():
-        cat_result = assess_category(project_dir, cat_id, cat_data)
+        cat_result = assess_category(cat_id, cat_data, doc_evidence, code_scan["code_evidence"])
         category_results.append(cat_result)
 
         # Calculate weighted average
@@ -586,9 +1048,8 @@ def main():
 
     overall_score = round((weighted_score / total_weight) * 100, 1) if total_weight > 0 else 0
 
-    # Additional scans
-    phi_detection = detect_phi_handling(project_dir)
-    vulnerabilities = detect_security_vulnerabilities(project_dir)
+    phi_detection = code_scan["phi_detection"]
+    vulnerabilities = code_scan["vulnerabilities"]
 
     # Risk assessment
     risk_assessment = calculate_risk_level(overall_score, vulnerabilities, phi_detection)
@@ -598,17 +1059,7 @@ def main():
         "assessment_date": datetime.now().isoformat(),
         "overall_score": overall_score,
         "risk_assessment": risk_assessment,
-        "categories": category_results if args.detailed else [
-            {
-                "category": c["category"],
-                "title": c["title"],
-                "score": c["score"],
-                "compliant": c["compliant"],
-                "partial": c["partial"],
-                "gaps": c["gaps"]
-            }
-            for c in category_results
-        ],
+        "categories": category_results,
         "phi_detection": phi_detection,
         "vulnerabilities": vulnerabilities,
         "recommendations": []
@@ -617,7 +1068,21 @@ def main():
     result["recommendations"] = generate_recommendations(result)
 
     if args.json:
-        print(json.dumps(result, indent=2))
+        # Recommendations and the text report need the per-control results;
+        # JSON output only includes them with --detailed
+        if not args.detailed:
+            result["categories"] = [
+                {
+                    "category": c["category"],
+                    "title": c["title"],
+                    "score": c["score"],
+                    "compliant": c["compliant"],
+                    "partial": c["partial"],
+                    "gaps": c["gaps"]
+                }
+                for c in category_results
+            ]
+        print_json_report(result)
     else:
         print_text_report(result)
 
@@ -12,14 +12,20 @@ Usage:
 """
 
 import argparse
+import fnmatch
 import json
 import os
 import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
 
+try:
+    import ahocorasick
+except ImportError:  # optional speed-up; keywords are looked up one by one otherwise
+    ahocorasick = None
 
 # QSR sections and requirements
 QSR_REQUIREMENTS = {
@@ -318,63 +324,248 @@ QSR_REQUIREMENTS = {
 }
 
 
-def search_documentation(project_dir: Path, patterns: List[str], keywords: List[str]) -> Dict:
-    """Search for documentation matching patterns and keywords."""
+# Documentation directories searched, in this order, before the whole project
+DOC_DIRS = ("qms", "quality", "docs", "documentation", "procedures", "sops", "dhf", "dmr")
+
+# Document types matched against the doc_patterns, and those searched for keywords
+DOC_EXTENSIONS = (".md", ".pdf", ".docx", ".doc", ".txt")
+TEXT_EXTENSIONS = (".md", ".txt")
+
+# Dependency, cache and build output directories the documentation scan does
+# not descend into, besides hidden directories
+SKIP_DIRS = frozenset({"node_modules", "venv", ".venv", "__pycache__", ".git", "dist", "build", ".tox"})
+
+# Lowercased name stems of the doc patterns, which are all a stem followed by
+# "*". File names are matched case-insensitively against all of them at once:
+# the combined regex rejects most names in one call, and the stems a name
+# starts with are looked up by prefix. Stems with glob characters of their
+# own are matched with their fnmatch translation.
+_DOC_STEMS = frozenset(
+    stem.lower()
+    for section_data in QSR_REQUIREMENTS.values()
+    for subsection_data in section_data["subsections"].values()
+    for stem in (pattern[:-1] if pattern.endswith("*") else pattern for pattern in subsection_data["doc_patterns"])
+    if stem and not any(c in stem for c in "*?[")
+)
+_DOC_STEM_RE = re.compile("|".join(re.escape(stem) for stem in sorted(_DOC_STEMS)))
+_MAX_DOC_STEM_LEN = max(map(len, _DOC_STEMS))
+
+# Lowercased keywords of all subsections. Each text file is read once and the
+# keywords it contains are collected for all subsections, in one Aho-Corasick
+# pass when pyahocorasick is installed. Files are searched as bytes, so the
+# keywords are also kept UTF-8 encoded; the automaton is keyed by str and
+# searches the bytes as Latin-1 text, which maps byte for byte.
+_KEYWORDS = frozenset(
+    keyword.lower()
+    for section_data in QSR_REQUIREMENTS.values()
+    for subsection_data in section_data["subsections"].values()
+    for keyword in subsection_data["keywords"]
+)
+_KEYWORD_BYTES = {keyword.encode(): keyword for keyword in _KEYWORDS}
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _encoded, _keyword in _KEYWORD_BYTES.items():
+        _KEYWORD_AUTOMATON.add_word(_encoded.decode("latin-1"), _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_AUTOMATON = None
+
+# Text files are searched in blocks of this size, so a large manual is never
+# held in memory whole. Consecutive blocks overlap by the longest keyword
+# less one byte, so a keyword spanning two blocks is still found.
+KEYWORD_BLOCK_BYTES = 1024 * 1024
+_KEYWORD_OVERLAP = max(map(len, _KEYWORD_BYTES)) - 1
+
+
+class DocScope(NamedTuple):
+    """Files covered by one documentation directory, or by the whole project."""
+    entries: Tuple[Tuple[str, str], ...]  # (relative path, file name) in walk order
+    documents: Dict[Tuple[str, str], List[str]]  # (stem, extension) -> matching relative paths
+    # Text file -> _KEYWORDS it contains, None if unreadable. Shared by all
+    # scopes of a project, so it also holds files outside this scope.
+    keywords: Dict[str, Optional[frozenset]]
+
+
+ProjectScopes = Tuple[DocScope, ...]
+
+
+@lru_cache(maxsize=None)
+def _document_matches(name: str) -> Tuple[Tuple[str, str], ...]:
+    """List the (stem, extension) pairs of the doc patterns ``name`` matches, ignoring case."""
+    name = name.lower()
+    if not name.endswith(DOC_EXTENSIONS) or not _DOC_STEM_RE.match(name):
+        return ()
+    extensions = [ext for ext in DOC_EXTENSIONS if name.endswith(ext)]
+    return tuple(
+        (name[:end], ext)
+        for end in range(1, min(len(name), _MAX_DOC_STEM_LEN) + 1)
+        if name[:end] in _DOC_STEMS
+        for ext in extensions
+        if len(name) >= end + len(ext)
+    )
+
+
+def _read_lower(path: str) -> str:
+    """Read a text file, lowercased, ignoring undecodable bytes."""
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        return f.read().lower()
+
+
+def _text_keywords(path: str) -> Optional[frozenset]:
+    """Return the _KEYWORDS the text file at ``path`` contains, or None if it cannot be read.
+
+    The file is read as bytes and lowercased as ASCII, without decoding it.
+    """
+    found = set()
+    try:
+        with open(path, 'rb') as f:
+            tail = b""
+            while True:
+                block = f.read(KEYWORD_BLOCK_BYTES)
+                if not block:
+                    break
+                content = tail + block.lower()
+                if _KEYWORD_AUTOMATON is not None:
+                    found.update(keyword for _, keyword in _KEYWORD_AUTOMATON.iter(content.decode("latin-1")))
+                else:
+                    found.update(keyword for encoded, keyword in _KEYWORD_BYTES.items() if encoded in content)
+                tail = content[-_KEYWORD_OVERLAP:] if _KEYWORD_OVERLAP else b""
+    except Exception:
+        return None
+    return frozenset(found)
+
+
+def _doc_scope(root: str, entries: Tuple[Tuple[str, str], ...],
+               text_keywords: Dict[str, Optional[frozenset]]) -> DocScope:
+    """Index ``entries`` by the doc patterns their names match and the keywords their text contains.
+
+    ``text_keywords`` is shared between the scopes of a project, so each text
+    file is read once.
+    """
+    documents: Dict[Tuple[str, str], List[str]] = {}
+    for rel_path, name in entries:
+        for key in _document_matches(name):
+            documents.setdefault(key, []).append(rel_path)
+        if name.endswith(TEXT_EXTENSIONS) and rel_path not in text_keywords:
+            text_keywords[rel_path] = _text_keywords(os.path.join(root, rel_path))
+    return DocScope(entries, documents, text_keywords)
+
+
+def _walk_entries(top: str, prefix_len: int) -> List[Tuple[str, str]]:
+    """List (relative path, file name) for every file below ``top``.
+
+    Hidden directories and those in SKIP_DIRS are pruned before descending,
+    and symlinked directories below ``top`` are not followed.
+    """
+    entries = []
+    for root, dirs, files in os.walk(top):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+        rel_root = os.path.join(root, "")[prefix_len:]
+        for name in files:
+            entries.append((rel_root + name, name))
+    return entries
+
+
+def _scan_project(project_dir: Path) -> ProjectScopes:
+    """Walk the project once and list the files each documentation search covers.
+
+    Returns the files below each existing DOC_DIRS directory, in DOC_DIRS
+    order, followed by those of the whole project, each indexed by the doc
+    patterns and keywords they match. Directories inside the project are
+    listed from the one project walk; symlinked ones, which that walk does
+    not follow, are walked on their own.
+    """
+    root = str(project_dir)
+    prefix_len = len(os.path.join(root, ""))
+    project_entries = _walk_entries(root, prefix_len)
+    text_keywords: Dict[str, Optional[frozenset]] = {}
+
+    scopes = []
+    for name in DOC_DIRS:
+        path = os.path.join(root, name)
+        if not os.path.isdir(path):
+            continue
+        if os.path.islink(path):
+            entries = tuple(_walk_entries(path, prefix_len))
+        else:
+            prefix = os.path.join(name, "")
+            entries = tuple(entry for entry in project_entries if entry[0].startswith(prefix))
+        scopes.append(_doc_scope(root, entries, text_keywords))
+    scopes.append(_doc_scope(root, tuple(project_entries), text_keywords))
+    return tuple(scopes)
+
+
+@lru_cache(maxsize=None)
+def _search_terms(patterns: Tuple[str, ...], keywords: Tuple[str, ...]) -> Tuple:
+    """Compile a subsection's doc patterns and keywords for search_documentation.
+
+    Returns the (stem, extension) keys of the patterns in _DOC_STEMS, a
+    case-insensitive match function for the other patterns or None, the
+    lowercased keywords, and whether they are all in _KEYWORDS.
+    """
+    doc_keys = []
+    other_patterns = []
+    for pattern in patterns:
+        stem = (pattern[:-1] if pattern.endswith("*") else pattern).lower()
+        if stem in _DOC_STEMS:
+            doc_keys.extend((stem, ext) for ext in DOC_EXTENSIONS)
+        else:
+            other_patterns.extend(fnmatch.translate(f"{stem}*{ext}") for ext in DOC_EXTENSIONS)
+    match = re.compile("|".join(other_patterns), re.IGNORECASE).match if other_patterns else None
+    wanted = frozenset(keyword.lower() for keyword in keywords)
+    return tuple(doc_keys), match, wanted, wanted <= _KEYWORDS
+
+
+def search_documentation(project_dir: Path, patterns: List[str], keywords: List[str],
+                         scopes: Optional[ProjectScopes] = None) -> Dict:
+    """Search for documentation matching patterns and keywords.
+
+    Both lists of matching documents are reported sorted. ``scopes`` is the
+    project listing from _scan_project. It is built here if not given;
+    callers searching for several subsections pass it in so the project is
+    walked only once.
+    """
+    if scopes is None:
+        scopes = _scan_project(project_dir)
+    root = str(project_dir)
     result = {
         "documents_found": [],
         "keyword_matches": [],
         "evidence_strength": "none"
     }
-
-    # Common documentation directories
-    doc_dirs = [
-        project_dir / "qms",
-        project_dir / "quality",
-        project_dir / "docs",
-        project_dir / "documentation",
-        project_dir / "procedures",
-        project_dir / "sops",
-        project_dir / "dhf",
-        project_dir / "dmr",
-        project_dir
-    ]
-
-    # Search for document patterns
-    for doc_dir in doc_dirs:
-        if not doc_dir.exists():
-            continue
-
-        for pattern in patterns:
-            for ext in ["*.md", "*.pdf", "*.docx", "*.doc", "*.txt"]:
-                full_pattern = f"**/{pattern}{ext}" if not pattern.endswith("*") else f"**/{pattern[:-1]}{ext}"
+    documents_found = set()
+    keyword_matches = set()
+
+    doc_keys, match, wanted, listed = _search_terms(tuple(patterns), tuple(keywords))
+
+    # Search for document patterns, matching file names case-insensitively
+    for entries, documents, _ in scopes:
+        for key in doc_keys:
+            documents_found.update(documents.get(key, ()))
+        if match is not None:
+            documents_found.update(rel_path for rel_path, name in entries if match(name))
+
+    # Search for keywords in markdown and text files. QSR keywords were looked
+    # up when the project was listed; other keywords need the files read again.
+    for entries, _, text_keywords in scopes:
+        for rel_path, name in entries:
+            if not name.endswith(TEXT_EXTENSIONS) or rel_path in keyword_matches:
+                continue
+            if listed:
+                found = text_keywords[rel_path]
+                if found is None or found.isdisjoint(wanted):
+                    continue
+            else:
                 try:
-                    matches = list(doc_dir.glob(full_pattern))
-                    for match in matches:
-                        rel_path = str(match.relative_to(project_dir))
-                        if rel_path not in result["documents_found"]:
-                            result["documents_found"].append(rel_path)
+                    content = _read_lower(os.path.join(root, rel_path))
                 except Exception:
                     continue
+                if not any(keyword in content for keyword in wanted):
+                    continue
+            keyword_matches.add(rel_path)
 
-    # Search for keywords in markdown and text files
-    for doc_dir in doc_dirs:
-        if not doc_dir.exists():
-            continue
-
-        for ext in ["*.md", "*.txt"]:
-            try:
-                for file_path in doc_dir.glob(f"**/{ext}"):
-                    try:
-                        content = file_path.read_text(encoding='utf-8', errors='ignore').lower()
-                        for keyword in keywords:
-                            if keyword.lower() in content:
-                                rel_path = str(file_path.relative_to(project_dir))
-                                if rel_path not in result["keyword_matches"]:
-                                    result["keyword_matches"].append(rel_path)
-                    except Exception:
-                        continue
-            except Exception:
-                continue
+    result["documents_found"] = sorted(documents_found)
+    result["keyword_matches"] = sorted(keyword_matches)
 
     # Determine evidence strength
     if result["documents_found"] and result["keyword_matches"]:
@@ -387,8 +578,11 @@ def search_documentation(project_dir: Path, patterns: List[str], keywords: List[
     return result
 
 
-def assess_section(project_dir: Path, section_id: str, section_data: Dict) -> Dict:
+def assess_section(project_dir: Path, section_id: str, section_data: Dict,
+                   scopes: Optional[ProjectScopes] = None) -> Dict:
     """Assess compliance for a QSR section."""
+    if scopes is None:
+        scopes = _scan_project(project_dir)
     result = {
         "section": section_id,
         "title": section_data["title"],
@@ -402,7 +596,8 @@ def assess_section(project_dir: Path, section_id: str, section_data: Dict) -> Di
         evidence = search_documentation(
             project_dir,
             subsection_data["doc_patterns"],
-            subsection_data["keywords"]
+            subsection_data["keywords"],
+            scopes
         )
 
         subsection_result = {
@@ -582,10 +777,11 @@ def main():
             print(f"Available sections: {', '.join(QSR_REQUIREMENTS.keys())}")
             sys.exit(1)
 
-    # Perform assessment
+    # Perform assessment, walking the project once for all sections
+    scopes = _scan_project(project_dir)
     assessment_results = []
     for section_id, section_data in sections_to_assess.items():
-        section_result = assess_section(project_dir, section_id, section_data)
+        section_result = assess_section(project_dir, section_id, section_data, scopes)
         assessment_results.append(section_result)
 
     # Generate reports